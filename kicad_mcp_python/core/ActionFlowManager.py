@@ -1,8 +1,10 @@
+import functools
 import logging
 
 from typing import Any, Dict, Optional, Callable
 
 from mcp.server.fastmcp import FastMCP
+from mcp.types import AnyFunction
 from kipy import KiCad
 from .mcp_manager import ToolManager
 
@@ -27,16 +29,11 @@ class ActionFlowManager(ToolManager):
 
     def get_next_action(self, current_action: str) -> Optional[str]:
         """Returns the action to be executed after the current action"""
-        try:
-            current_index = self.action_flow.index(current_action)
-            if current_index + 1 < len(self.action_flow):
-                return self.action_flow[current_index + 1]
-            return None
-        except ValueError:
-            return None
+        return self.flow_graph.get(current_action)
 
-    def response_formatter(self, result: Any, status: str = 'success', error_type: Optional[str] = None) -> Dict[str, Any]:
-        """Formats and returns the result"""
+    def response_formatter(self, result: Any, status: str = 'success', error_type: Optional[str] = None,
+                           action: Optional[str] = None) -> Dict[str, Any]:
+        """Formats and returns the result of action, naming the action that follows it"""
         if status == 'error':
             return {
                 "result": result,
@@ -44,7 +41,7 @@ class ActionFlowManager(ToolManager):
                 "error_type": error_type
             }
         else:
-            next_action = self.get_next_action(self.action_flow[-1]) if self.action_flow else None
+            next_action = self.get_next_action(action) if action else None
             return {
                 "result": result,
                 "status": status,
@@ -58,6 +55,9 @@ class ActionFlowManager(ToolManager):
         A function that adds a method to the action_flow list and registers it as an MCP tool.
         The registered function formats the result through self.response_formatter upon execution.
         """
+        if self.action_flow:
+            self.flow_graph[self.action_flow[-1]] = func.__name__
+        self.flow_graph[func.__name__] = None
         self.action_flow.append(func.__name__)
         self.add_tool(func)
         
@@ -65,6 +65,10 @@ class ActionFlowManager(ToolManager):
         self.mcp_tools[func.__name__] = func
         
     
+    def _formatter_for(self, func: AnyFunction) -> AnyFunction:
+        # Each tool's wrapper reports the action that ran, so its successor can be looked up
+        return functools.partial(self.response_formatter, action=func.__name__)
+    
     def get_mcp_tools(self) -> Dict[str, Callable]:
         """Returns the registered MCP tools"""
         return self.mcp_tools
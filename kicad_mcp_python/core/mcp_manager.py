@@ -1,10 +1,55 @@
-import inspect
+import functools
 
-from typing import Any, Optional, get_origin, Dict
+from typing import Any, Optional, Dict
 
-from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.fastmcp import FastMCP
 from mcp.types import AnyFunction, Resource
-from mcp.server.fastmcp.tools.base import Tool, func_metadata
+
+
+def no_board_required(func: AnyFunction) -> AnyFunction:
+    """
+    Marks a tool that never touches the KiCad board, so add_tool skips
+    initialize_kicad() before running it.
+    """
+    func._needs_board = False
+    return func
+
+
+# Tool wrappers are generated from source so the board check and error hook are decided
+# once at registration time and func / formatter / initialize / on_error are plain globals at call time.
+_WRAPPER_SOURCE = """
+def wrapper(*args, **kwargs):
+    {initialize}
+    try:
+        return formatter(func(*args, **kwargs))
+    except Exception as e:
+        {on_error}
+        return formatter(str(e), status='error', error_type=type(e).__name__)
+"""
+_WRAPPER_CODE = {
+    (needs_board, has_on_error): compile(
+        _WRAPPER_SOURCE.format(
+            initialize="initialize()" if needs_board else "pass",
+            on_error="on_error(e)" if has_on_error else "pass",
+        ),
+        "<tool_wrapper>",
+        "exec",
+    )
+    for needs_board in (True, False)
+    for has_on_error in (True, False)
+}
+
+
+def _compile_tool_wrapper(func: AnyFunction, formatter: AnyFunction, initialize: Optional[AnyFunction],
+                          on_error: Optional[AnyFunction] = None) -> AnyFunction:
+    """
+    Returns a wrapper that runs initialize() (when given), calls func and
+    passes the result, or the error, through formatter. on_error (when given)
+    sees the exception before it is formatted.
+    """
+    namespace = {"func": func, "formatter": formatter, "initialize": initialize, "on_error": on_error}
+    exec(_WRAPPER_CODE[initialize is not None, on_error is not None], namespace)
+    return functools.update_wrapper(namespace["wrapper"], func)
 
 
 
@@ -55,54 +100,31 @@ class ToolManager:
         return result # init function, will be use in ActionFlowmanager
 
 
+    def _formatter_for(self, func: AnyFunction) -> AnyFunction:
+        """Returns the formatter func's tool wrapper passes its results through."""
+        return self.response_formatter
+
+
     def add_tool(self, func: AnyFunction):
         """
         Adds a tool to the MCP with its function name and documentation.
         """
         try:
-
-            def initialize_func(*args, **kwargs):
-                """
-                A wrapper function that calls the original function and formats the result.
-                """
-                self.initialize_kicad() 
-                try:
-                    result = func(*args, **kwargs)
-                    return self.response_formatter(result)
-                except Exception as e:
-                    return self.response_formatter(str(e), status='error', error_type=type(e).__name__)
-            
-            # https://github.com/modelcontextprotocol/python-sdk/blob/main/src/mcp/server/fastmcp/tools/base.py#L40
-            # The reason for directly using Tool.from_function to register the MCP tool
-            # is because context_kwarg is required.
-            context_kwarg = None
-            sig = inspect.signature(func)
-            for param_name, param in sig.parameters.items():
-                if get_origin(param.annotation) is not None:
-                    continue
-                if issubclass(param.annotation, Context):
-                    context_kwarg = param_name
-                    break
-                
-            func_arg_metadata = func_metadata(
+            needs_board = getattr(func, '_needs_board', True)
+            initialize_func = _compile_tool_wrapper(
                 func,
-                skip_names=[context_kwarg] if context_kwarg is not None else [],
+                self._formatter_for(func),
+                self.initialize_kicad if needs_board else None,
+                getattr(self, '_on_tool_error', None),
             )
-            parameters = func_arg_metadata.arg_model.model_json_schema()
-
-            tool = Tool(
-                fn=initialize_func,
+            
+            # The wrapper's __wrapped__ points at func, so FastMCP builds the
+            # argument model from func's signature (bound methods already omit self).
+            self.mcp.add_tool(
+                initialize_func,
                 name=func.__name__,
-                title=None,
                 description=func.__doc__,
-                parameters=parameters,
-                fn_metadata=func_arg_metadata,
-                is_async=False,
-                context_kwarg=context_kwarg,
-                annotations=None,
             )
-            self.mcp._tool_manager._tools[tool.name] = tool
-            
             
         except Exception as e:
-            raise RuntimeError(f"Failed to register tool {func.__name__}: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to register tool {func.__name__}: {str(e)}")
@@ -1,14 +1,80 @@
+import os
+
 from mcp.server.fastmcp import FastMCP
 from kipy import KiCad
+from kipy.errors import ConnectionError as KiCadConnectionError
+
+from ..utils.project_detector import get_project_detector
+
 
 class PCBTool:
     """
     Represents a PCB module with its properties and methods.
     """
 
+    # Cached board handle, shared by every tool call on this instance.
+    board = None
+    _board_path = None
+    _board_mtime = None
+
     def initialize_kicad(self):
-        # TODO: Need to add logic to refresh the board.
+        """
+        Makes sure self.board holds a usable board handle.
+
+        The handle is fetched from KiCad once and reused until the .kicad_pcb
+        file on disk changes (or invalidate_board() is called), so tools no
+        longer pay an IPC round-trip on every invocation.
+        """
+        if self.board is not None and not self._board_changed_on_disk():
+            return
+
         try:
             self.board = KiCad().get_board()
         except Exception as e:
             raise RuntimeError(f"Failed to initialize the board: {str(e)}")
+
+        self._board_path = self._resolve_board_path()
+        self._board_mtime = self._get_board_mtime()
+
+    def invalidate_board(self):
+        """Drops the cached board handle so the next tool call fetches a fresh one."""
+        self.board = None
+        self._board_path = None
+        self._board_mtime = None
+
+    def _on_tool_error(self, error: BaseException):
+        """
+        Called by the tool wrapper when a tool raises. A lost IPC connection
+        leaves the cached handle pointing at a dead socket, so drop it and let
+        the next call fetch a fresh board.
+        """
+        while error is not None:
+            if isinstance(error, (KiCadConnectionError, ConnectionError)):
+                self.invalidate_board()
+                return
+            error = error.__cause__ or error.__context__
+
+    def mark_board_saved(self):
+        """Records a save; our own write to the .kicad_pcb must not invalidate the cached handle."""
+        self._board_mtime = self._get_board_mtime()
+
+    def _resolve_board_path(self):
+        try:
+            return get_project_detector().find_pcb_path(self.board.name)
+        except Exception:
+            return None
+
+    def _get_board_mtime(self):
+        if self._board_path is None:
+            return None
+        try:
+            return os.stat(self._board_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _board_changed_on_disk(self) -> bool:
+        # Without a file to compare against we cannot tell, so refresh as before.
+        if self._board_path is None:
+            return True
+        mtime = self._get_board_mtime()
+        return mtime is None or mtime != self._board_mtime
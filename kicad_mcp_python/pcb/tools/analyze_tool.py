@@ -1,13 +1,17 @@
+import base64
+import logging
+
 from dotenv import load_dotenv
 
 
 from ...utils.convert_proto import (
     BOARDITEM_TYPE_CONFIGS, 
-    get_object_type
+    get_object_type,
+    get_wrapper_class
 )
 
 from ..pcbmodule import PCBTool
-from ...core.mcp_manager import ToolManager
+from ...core.mcp_manager import ToolManager, no_board_required
 
 from ...utils.kicad_cli import KiCadPCBConverter
 from ...utils.project_detector import get_project_detector
@@ -17,6 +21,15 @@ from mcp.types import ImageContent
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Resolved once at import instead of on every get_board_status call
+_CACHED_TYPES = {item_type: get_object_type(item_type) for item_type in BOARDITEM_TYPE_CONFIGS}
+_TYPE_BY_WRAPPER = {
+    get_wrapper_class(item_type): item_type
+    for item_type, object_type in _CACHED_TYPES.items() if object_type is not None
+}
+
 
 class BoardAnalyzer(ToolManager, PCBTool):
     '''
@@ -26,10 +39,10 @@ class BoardAnalyzer(ToolManager, PCBTool):
     def __init__(self, mcp: FastMCP):
         super().__init__(mcp)
         self.pcb_converter = KiCadPCBConverter()
-        self.add_tool(self.get_board_status)        
-        self.add_tool(self.get_items_by_type)        
+        self.add_tool(self.get_board_status)
+        self.add_tool(self.get_items_by_type)
         self.add_tool(self.get_item_type_args_hint)
-        self.add_tool(self.get_project_summary)        
+        self.add_tool(self.get_project_summary)
         
             
     def get_board_status(self):
@@ -52,27 +65,24 @@ class BoardAnalyzer(ToolManager, PCBTool):
                     which are caught and reported in the result dictionary.
         
         '''
-        result = {}
-        for item_type in BOARDITEM_TYPE_CONFIGS.keys():
-            try:
-                result[item_type] = [item for item in self.board.get_items(get_object_type(item_type))]
-            except Exception as e:
-                result[item_type] = f'Not yet implemented, {str(e)}'
+        result = self._collect_board_items()
         
-        # Auto-save the board before generating screenshot to ensure changes are visible
+        # Always save before the screenshot: kicad-cli renders the file on disk, and
+        # edits made in the editor since the last save would otherwise be missing.
         try:
             self.board.save()
+            self.mark_board_saved()
         except Exception as e:
-            # Log the error but don't fail the entire operation
-            print(f"Warning: Auto-save failed: {str(e)}")
+            # Log the error but don't fail the entire operation; stdout carries the MCP stream
+            logger.warning("Auto-save failed: %s", e)
                 
-        base64_image = self.pcb_converter.pcb_to_jpg_via_svg(
+        jpg_data = self.pcb_converter.pcb_to_jpg_bytes(
             boardname=self.board.name,
             )
         
         return [result, ImageContent(
             type="image",
-            data=base64_image,
+            data=base64.b64encode(jpg_data).decode('ascii'),
             mimeType="image/jpeg"
         )]
     
@@ -90,11 +100,44 @@ class BoardAnalyzer(ToolManager, PCBTool):
         
         result = {
             item.id.value:item for item in self.board.get_items(
-            get_object_type(item_type)
+            _CACHED_TYPES[item_type]
             )}
         return result
     
     
+    def _collect_board_items(self):
+        '''
+        Fetches every board item type in a single get_items request and buckets
+        the items by type name. Falls back to one request per type if the
+        batched request fails, so one bad type cannot hide the others.
+        '''
+        batch_types = [object_type for object_type in _CACHED_TYPES.values() if object_type is not None]
+        try:
+            items = self.board.get_items(batch_types)
+        except Exception:
+            result = {}
+            for item_type, object_type in _CACHED_TYPES.items():
+                try:
+                    result[item_type] = [item for item in self.board.get_items(object_type)]
+                except Exception as e:
+                    result[item_type] = f'Not yet implemented, {str(e)}'
+            return result
+        
+        result = {
+            item_type: [] if object_type is not None else 'Not yet implemented, no KiCad object type'
+            for item_type, object_type in _CACHED_TYPES.items()
+        }
+        for item in items:
+            # Shapes and dimensions come back as concrete subclasses of the wrapper
+            for cls in type(item).__mro__:
+                item_type = _TYPE_BY_WRAPPER.get(cls)
+                if item_type is not None:
+                    result[item_type].append(item)
+                    break
+        return result
+    
+    
+    @no_board_required
     def get_item_type_args_hint(self, item_type: str):
         '''
         Retrieves the configuration arguments for a specific board item type.
@@ -108,6 +151,7 @@ class BoardAnalyzer(ToolManager, PCBTool):
         result = BOARDITEM_TYPE_CONFIGS[item_type]
         return result
     
+    @no_board_required
     def get_project_summary(self):
         '''
         Retrieves a comprehensive summary of all detected KiCad projects.
@@ -2,7 +2,7 @@ from typing import Dict
 
 from ..pcbmodule import PCBTool
 from ...core.ActionFlowManager import ActionFlowManager
-from ...core.mcp_manager import ToolManager
+from ...core.mcp_manager import ToolManager, no_board_required
 from ...utils.convert_proto import (
     BOARDITEM_TYPE_CONFIGS, 
     get_proto_class,
@@ -101,6 +101,7 @@ class CreateItemFlowManager(ActionFlowManager, PCBTool):
     # TODO: 
     # Will change to a class that manages the step-by-step flow of create_item. 
     # Writing functions one by one like this is not ideal.
+    @no_board_required
     def create_item_step_1(self):
         """ # create_item_1
         
@@ -118,6 +119,7 @@ class CreateItemFlowManager(ActionFlowManager, PCBTool):
         return BOARDITEM_TYPE_CONFIGS.keys()
     
         
+    @no_board_required
     def create_item_step_2(
         self, 
         item_type: str
@@ -186,6 +188,7 @@ class EditItemFlowManager(ActionFlowManager, PCBTool):
         self.action_setter(self.edit_item_step_3)
     
     
+    @no_board_required
     def edit_item_step_1(self):
         """ # edit_item_1
         
@@ -285,6 +288,7 @@ class MoveItemFlowManager(ActionFlowManager, PCBTool):
         self.action_setter(self.move_item_step_3)
     
     
+    @no_board_required
     def move_item_step_1(self):
         """ # move_item_1
         
@@ -391,7 +395,7 @@ class MoveItemFlowManager(ActionFlowManager, PCBTool):
         
         
         
-class RemoveItemFlowManager(ActionFlowManager):
+class RemoveItemFlowManager(ActionFlowManager, PCBTool):
     """A class that manages the step-by-step flow of remove Item"""
     
     def __init__(self, mcp: FastMCP):
@@ -442,6 +446,7 @@ class SaveBoardTool(ToolManager, PCBTool):
         """
         try:
             self.board.save()
+            self.mark_board_saved()
             return f"Successfully saved board: {self.board.name}"
         except Exception as e:
             return f"Failed to save board: {str(e)}"
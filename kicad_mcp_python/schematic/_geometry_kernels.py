@@ -0,0 +1,61 @@
+"""
+Numba-compiled geometry kernels for collision detection.
+
+Importing this module requires numba; callers import it lazily and fall
+back to the NumPy implementations in component_boundary when it is missing.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _segment_hits_box(sx, sy, ex, ey, lo_x, lo_y, hi_x, hi_y):
+    """Liang-Barsky slab test of one segment against one rectangle (edges inclusive)"""
+    t_enter = 0.0
+    t_exit = 1.0
+
+    dx = ex - sx
+    if dx == 0:
+        if sx < lo_x or sx > hi_x:
+            return False
+    else:
+        t1 = (lo_x - sx) / dx
+        t2 = (hi_x - sx) / dx
+        t_enter = max(t_enter, min(t1, t2))
+        t_exit = min(t_exit, max(t1, t2))
+
+    dy = ey - sy
+    if dy == 0:
+        if sy < lo_y or sy > hi_y:
+            return False
+    else:
+        t1 = (lo_y - sy) / dy
+        t2 = (hi_y - sy) / dy
+        t_enter = max(t_enter, min(t1, t2))
+        t_exit = min(t_exit, max(t1, t2))
+
+    return t_enter <= t_exit
+
+
+@njit(cache=True, parallel=True)
+def collide_segments_bboxes(seg_starts, seg_ends, top_left, bottom_right, clearance):
+    """
+    (S, N) bool matrix of which segments touch which rectangles once each
+    rectangle is expanded by clearance. All inputs are int64; points are (x, y) rows.
+    """
+    n_seg = seg_starts.shape[0]
+    n_box = top_left.shape[0]
+    hits = np.zeros((n_seg, n_box), dtype=np.bool_)
+
+    for j in prange(n_box):
+        lo_x = top_left[j, 0] - clearance
+        lo_y = top_left[j, 1] - clearance
+        hi_x = bottom_right[j, 0] + clearance
+        hi_y = bottom_right[j, 1] + clearance
+        for i in range(n_seg):
+            hits[i, j] = _segment_hits_box(seg_starts[i, 0], seg_starts[i, 1],
+                                           seg_ends[i, 0], seg_ends[i, 1],
+                                           lo_x, lo_y, hi_x, hi_y)
+
+    return hits
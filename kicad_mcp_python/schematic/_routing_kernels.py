@@ -0,0 +1,100 @@
+"""
+Numba-compiled kernels for batch Manhattan and bus-aware routing.
+
+Importing this module requires numba; callers import it lazily and fall
+back to the NumPy implementations in smart_routing when it is missing.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True)
+def route_manhattan_batch(start_xy, end_xy, start_orientation, end_orientation, grid,
+                          break_xy, lengths):
+    """
+    Routing preferences, break point and length of N independent pin pairs,
+    written into the preallocated break_xy (N, 2) and lengths (N,) int64 arrays.
+    Same rules as SmartRoutingEngine._get_routing_preferences followed by a
+    Manhattan compute_break_point.
+    """
+    for i in prange(start_xy.shape[0]):
+        sx = start_xy[i, 0]
+        sy = start_xy[i, 1]
+        ex = end_xy[i, 0]
+        ey = end_xy[i, 1]
+        so = start_orientation[i]
+        eo = end_orientation[i]
+
+        prefer_horizontal = False
+        prefer_vertical = False
+        if abs(sy - ey) < grid:
+            prefer_horizontal = True
+        elif abs(sx - ex) < grid:
+            prefer_vertical = True
+        elif 0 <= so < 4 and 0 <= eo < 4:
+            if so % 2 == 0 and eo % 2 == 0:
+                prefer_vertical = True
+            elif so % 2 == 1 and eo % 2 == 1:
+                prefer_horizontal = True
+
+        adx = abs(ex - sx)
+        ady = abs(ey - sy)
+        if prefer_vertical or (not prefer_horizontal and adx < ady):
+            break_xy[i, 0] = sx
+            break_xy[i, 1] = ey
+        else:
+            break_xy[i, 0] = ex
+            break_xy[i, 1] = sy
+        lengths[i] = adx + ady
+
+
+@njit(cache=True, parallel=True)
+def best_bus_connections(start_xy, end_xy, vertical, coord, range_start, range_end, align_tolerance,
+                         best_bus, connection_xy):
+    """
+    For each of N pin pairs, the bus giving the shortest start -> bus -> end
+    path (the first of equally short ones) and its connection point, written
+    into the preallocated best_bus (N,) and connection_xy (N, 2) arrays.
+    Same rules as SmartRoutingEngine._find_optimal_bus_connection_point.
+    """
+    for i in prange(start_xy.shape[0]):
+        sx = start_xy[i, 0]
+        sy = start_xy[i, 1]
+        ex = end_xy[i, 0]
+        ey = end_xy[i, 1]
+        best_length = np.inf
+        best = 0
+        best_x = 0
+        best_y = 0
+        for b in range(coord.shape[0]):
+            c = coord[b]
+            lo = range_start[b]
+            hi = range_end[b]
+            if vertical[b]:
+                y1 = min(max(sy, lo), hi)
+                y2 = min(max(ey, lo), hi)
+                y1_length = math.hypot(sx - c, sy - y1) + math.hypot(c - ex, y1 - ey)
+                y2_length = math.hypot(sx - c, sy - y2) + math.hypot(c - ex, y2 - ey)
+                x = c
+                y = y1 if y1_length <= y2_length else y2
+            else:
+                if abs(sy - c) < align_tolerance:
+                    x = sx
+                elif abs(ey - c) < align_tolerance:
+                    x = ex
+                else:
+                    x = (sx + ex) // 2
+                x = min(max(x, lo), hi)
+                y = c
+            length = math.hypot(sx - x, sy - y) + math.hypot(x - ex, y - ey)
+            if length < best_length:
+                best_length = length
+                best = b
+                best_x = x
+                best_y = y
+        best_bus[i] = best
+        connection_xy[i, 0] = best_x
+        connection_xy[i, 1] = best_y
@@ -13,12 +13,31 @@ Based on analysis of:
 Phase 3 Implementation: Component Avoidance
 """
 
-from typing import List, Dict, Tuple, Optional, Any, Set
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional, Any, Set
 from dataclasses import dataclass
 from enum import Enum
 import math
 
-from .smart_routing import Position, Symbol, RoutingPath
+import numpy as np
+
+from .spatial_index import STRIndex
+
+if TYPE_CHECKING:
+    from .smart_routing import Position, Symbol, RoutingPath
+
+
+_position_cls = None
+
+
+def _lazy_pos():
+    """Position class from smart_routing, imported on first use"""
+    global _position_cls
+    if _position_cls is None:
+        from .smart_routing import Position
+        _position_cls = Position
+    return _position_cls
 
 
 class BoundingBoxType(Enum):
@@ -28,7 +47,7 @@ class BoundingBoxType(Enum):
     FULL = "full"                  # Symbol body + pins + fields
 
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class BoundingBox:
     """Component bounding rectangle for collision detection"""
     top_left: Position
@@ -46,6 +65,7 @@ class BoundingBox:
     
     @property
     def center(self) -> Position:
+        Position = _lazy_pos()
         return Position(
             (self.top_left.x_nm + self.bottom_right.x_nm) // 2,
             (self.top_left.y_nm + self.bottom_right.y_nm) // 2
@@ -63,28 +83,16 @@ class BoundingBox:
     
     def _line_intersects_rectangle(self, p1: Position, p2: Position) -> bool:
         """Cohen-Sutherland line-rectangle intersection test"""
-        # Outcodes for Cohen-Sutherland algorithm
-        INSIDE = 0  # 0000
-        LEFT = 1    # 0001  
-        RIGHT = 2   # 0010
-        BOTTOM = 4  # 0100
-        TOP = 8     # 1000
-        
-        def compute_outcode(x: int, y: int) -> int:
-            code = INSIDE
-            if x < self.top_left.x_nm:
-                code |= LEFT
-            elif x > self.bottom_right.x_nm:
-                code |= RIGHT
-            if y < self.top_left.y_nm:
-                code |= BOTTOM
-            elif y > self.bottom_right.y_nm:
-                code |= TOP
-            return code
-        
-        # Compute outcodes for both endpoints
-        outcode1 = compute_outcode(p1.x_nm, p1.y_nm)
-        outcode2 = compute_outcode(p2.x_nm, p2.y_nm)
+        # Outcode bits: LEFT = 1, RIGHT = 2, BOTTOM = 4, TOP = 8
+        tl_x, tl_y = self.top_left.x_nm, self.top_left.y_nm
+        br_x, br_y = self.bottom_right.x_nm, self.bottom_right.y_nm
+        
+        # Work on plain ints so clipping never allocates Position objects
+        x1, y1 = p1.x_nm, p1.y_nm
+        x2, y2 = p2.x_nm, p2.y_nm
+        
+        outcode1 = (x1 < tl_x) | ((x1 > br_x) << 1) | ((y1 < tl_y) << 2) | ((y1 > br_y) << 3)
+        outcode2 = (x2 < tl_x) | ((x2 > br_x) << 1) | ((y2 < tl_y) << 2) | ((y2 > br_y) << 3)
         
         while True:
             if not (outcode1 | outcode2):
@@ -93,33 +101,32 @@ class BoundingBox:
             elif outcode1 & outcode2:
                 # Both points share an outside zone - no intersection
                 return False
+            
+            # Line might intersect - clip the outside endpoint to the rectangle edge
+            outcode_out = outcode1 or outcode2
+            
+            if outcode_out & 8:
+                x = x1 + (x2 - x1) * (br_y - y1) // (y2 - y1)
+                y = br_y
+            elif outcode_out & 4:
+                x = x1 + (x2 - x1) * (tl_y - y1) // (y2 - y1)
+                y = tl_y
+            elif outcode_out & 2:
+                y = y1 + (y2 - y1) * (br_x - x1) // (x2 - x1)
+                x = br_x
+            else:
+                y = y1 + (y2 - y1) * (tl_x - x1) // (x2 - x1)
+                x = tl_x
+            
+            code = (x < tl_x) | ((x > br_x) << 1) | ((y < tl_y) << 2) | ((y > br_y) << 3)
+            if outcode_out == outcode1:
+                x1, y1, outcode1 = x, y, code
             else:
-                # Line might intersect - clip the line
-                x, y = 0, 0
-                outcode_out = outcode1 if outcode1 else outcode2
-                
-                if outcode_out & TOP:
-                    x = p1.x_nm + (p2.x_nm - p1.x_nm) * (self.bottom_right.y_nm - p1.y_nm) // (p2.y_nm - p1.y_nm)
-                    y = self.bottom_right.y_nm
-                elif outcode_out & BOTTOM:
-                    x = p1.x_nm + (p2.x_nm - p1.x_nm) * (self.top_left.y_nm - p1.y_nm) // (p2.y_nm - p1.y_nm)
-                    y = self.top_left.y_nm
-                elif outcode_out & RIGHT:
-                    y = p1.y_nm + (p2.y_nm - p1.y_nm) * (self.bottom_right.x_nm - p1.x_nm) // (p2.x_nm - p1.x_nm)
-                    x = self.bottom_right.x_nm
-                elif outcode_out & LEFT:
-                    y = p1.y_nm + (p2.y_nm - p1.y_nm) * (self.top_left.x_nm - p1.x_nm) // (p2.x_nm - p1.x_nm)
-                    x = self.top_left.x_nm
-                
-                if outcode_out == outcode1:
-                    p1 = Position(x, y)
-                    outcode1 = compute_outcode(p1.x_nm, p1.y_nm)
-                else:
-                    p2 = Position(x, y)
-                    outcode2 = compute_outcode(p2.x_nm, p2.y_nm)
+                x2, y2, outcode2 = x, y, code
     
     def expand(self, margin_nm: int) -> 'BoundingBox':
         """Create expanded bounding box with clearance margin"""
+        Position = _lazy_pos()
         return BoundingBox(
             top_left=Position(
                 self.top_left.x_nm - margin_nm,
@@ -134,7 +141,53 @@ class BoundingBox:
         )
 
 
-@dataclass
+# Row encoding of BoundingBoxType used by ComponentBoundaryManager
+_BBOX_TYPES = list(BoundingBoxType)
+_BBOX_TYPE_ORDINALS = {bbox_type: i for i, bbox_type in enumerate(_BBOX_TYPES)}
+
+# Estimated extents: pinless symbols get a box this far around their position,
+# others their pin extents grown by the body margin
+_NO_PIN_MARGIN_NM = 1270000  # 1.27mm
+_BODY_MARGIN_NM = 635000  # 0.635mm
+
+
+def _estimate_bounds(symbols: List[Symbol]) -> np.ndarray:
+    """
+    (N, 4) int64 rows of (min_x, min_y, max_x, max_y), one per symbol, with
+    the pin extents of all symbols reduced in one pass over a flat pin array.
+    """
+    counts = np.fromiter((len(symbol.pins) for symbol in symbols), dtype=np.int64, count=len(symbols))
+    total = int(counts.sum())
+    pin_xy = np.fromiter(
+        (coord for symbol in symbols for pin in symbol.pins
+         for coord in (pin.position.x_nm, pin.position.y_nm)),
+        dtype=np.int64,
+        count=2 * total,
+    ).reshape(-1, 2)
+    
+    bounds = np.empty((len(symbols), 4), dtype=np.int64)
+    has_pins = counts > 0
+    if total:
+        # Offsets of the non-empty symbols are strictly increasing, so each
+        # reduceat range is exactly one symbol's pins
+        offsets = (np.cumsum(counts) - counts)[has_pins]
+        bounds[has_pins, 0] = np.minimum.reduceat(pin_xy[:, 0], offsets) - _BODY_MARGIN_NM
+        bounds[has_pins, 1] = np.minimum.reduceat(pin_xy[:, 1], offsets) - _BODY_MARGIN_NM
+        bounds[has_pins, 2] = np.maximum.reduceat(pin_xy[:, 0], offsets) + _BODY_MARGIN_NM
+        bounds[has_pins, 3] = np.maximum.reduceat(pin_xy[:, 1], offsets) + _BODY_MARGIN_NM
+    
+    no_pins = np.flatnonzero(~has_pins)
+    if len(no_pins):
+        centers = np.array(
+            [(symbols[i].position.x_nm, symbols[i].position.y_nm) for i in no_pins.tolist()],
+            dtype=np.int64,
+        )
+        bounds[no_pins, :2] = centers - _NO_PIN_MARGIN_NM
+        bounds[no_pins, 2:] = centers + _NO_PIN_MARGIN_NM
+    return bounds
+
+
+@dataclass(slots=True, frozen=True)
 class CollisionResult:
     """Result of collision detection analysis"""
     has_collision: bool
@@ -143,6 +196,70 @@ class CollisionResult:
     suggested_clearance: int
 
 
+def _segment_box_hits(start: np.ndarray, end: np.ndarray,
+                      top_left: np.ndarray, bottom_right: np.ndarray) -> np.ndarray:
+    """
+    Liang-Barsky slab test of one segment against N rectangles at once.
+
+    start / end are (x, y) pairs and top_left / bottom_right are (N, 2) int64
+    arrays; returns an (N,) bool mask of the rectangles the segment touches
+    (edges inclusive).
+    """
+    count = len(top_left)
+    hits = np.ones(count, dtype=bool)
+    t_enter = np.zeros(count)
+    t_exit = np.ones(count)
+
+    for axis in range(2):
+        lo = top_left[:, axis]
+        hi = bottom_right[:, axis]
+        s = start[axis]
+        d = end[axis] - s
+        if d == 0:
+            # Parallel to this slab - it must already lie between the edges
+            hits &= (lo <= s) & (s <= hi)
+        else:
+            t1 = (lo - s) / d
+            t2 = (hi - s) / d
+            t_enter = np.maximum(t_enter, np.minimum(t1, t2))
+            t_exit = np.minimum(t_exit, np.maximum(t1, t2))
+
+    return hits & (t_enter <= t_exit)
+
+
+_numba_kernel = None
+_numba_checked = False
+
+
+def _load_numba_kernel():
+    """Compiled collision kernel, or None when numba is not installed"""
+    global _numba_kernel, _numba_checked
+    if not _numba_checked:
+        _numba_checked = True
+        try:
+            from ._geometry_kernels import collide_segments_bboxes
+            _numba_kernel = collide_segments_bboxes
+        except ImportError:
+            _numba_kernel = None
+    return _numba_kernel
+
+
+def _collide_segments_bboxes(seg_starts: np.ndarray, seg_ends: np.ndarray,
+                             top_left: np.ndarray, bottom_right: np.ndarray,
+                             clearance: int) -> np.ndarray:
+    """(S, N) bool matrix of which segments touch which clearance-expanded rectangles"""
+    kernel = _load_numba_kernel()
+    if kernel is not None:
+        return kernel(seg_starts, seg_ends, top_left, bottom_right, clearance)
+
+    expanded_tl = top_left - clearance
+    expanded_br = bottom_right + clearance
+    hits = np.empty((len(seg_starts), len(top_left)), dtype=bool)
+    for i in range(len(seg_starts)):
+        hits[i] = _segment_box_hits(seg_starts[i], seg_ends[i], expanded_tl, expanded_br)
+    return hits
+
+
 class ComponentBoundaryManager:
     """
     Manages component boundaries for collision-aware routing.
@@ -154,7 +271,37 @@ class ComponentBoundaryManager:
     
     def __init__(self, clearance_nm: int = 635000):  # 0.635mm = 25 mils default clearance
         self.clearance_nm = clearance_nm
-        self.component_boundaries: Dict[str, BoundingBox] = {}
+        
+        # Boundaries are stored struct-of-arrays: one int64 row of
+        # (tl_x, tl_y, br_x, br_y) per component, grown geometrically
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._bbox_arr = np.empty((16, 4), dtype=np.int64)
+        self._types = np.empty(16, dtype=np.int8)
+        self._centers = np.empty((16, 2), dtype=np.int64)
+        self._count = 0
+        
+        # Spatial index over the rows, rebuilt lazily after boundaries change
+        self._index = STRIndex(np.empty((0, 4), dtype=np.int64))
+        self._index_dirty = False
+        
+        # (clearance_nm, expanded top_left, expanded bottom_right), dropped on change
+        self._expanded: Optional[Tuple[int, np.ndarray, np.ndarray]] = None
+    
+    @property
+    def component_boundaries(self) -> Dict[str, BoundingBox]:
+        """Boundaries keyed by symbol id, materialized from the row array"""
+        return {symbol_id: self._bbox_at(row) for row, symbol_id in enumerate(self._ids)}
+    
+    def _bbox_at(self, row: int) -> BoundingBox:
+        Position = _lazy_pos()
+        tl_x, tl_y, br_x, br_y = self._bbox_arr[row].tolist()
+        return BoundingBox(
+            top_left=Position(tl_x, tl_y),
+            bottom_right=Position(br_x, br_y),
+            symbol_id=self._ids[row],
+            bbox_type=_BBOX_TYPES[self._types[row]]
+        )
         
     def add_component_boundary(self, symbol: Symbol, bbox_type: BoundingBoxType = BoundingBoxType.BODY_PINS):
         """
@@ -163,32 +310,62 @@ class ComponentBoundaryManager:
         In production, this would call the new GetComponentBounds API we implemented.
         For now, we estimate based on symbol position and pin extents.
         """
-        if not symbol.pins:
-            # No pins - use simple box around symbol center
-            margin = 1270000  # 1.27mm
-            bbox = BoundingBox(
-                top_left=Position(symbol.position.x_nm - margin, symbol.position.y_nm - margin),
-                bottom_right=Position(symbol.position.x_nm + margin, symbol.position.y_nm + margin),
-                symbol_id=symbol.id,
-                bbox_type=bbox_type
-            )
-        else:
-            # Calculate bounding box from pin extents
-            min_x = min(pin.position.x_nm for pin in symbol.pins)
-            max_x = max(pin.position.x_nm for pin in symbol.pins)
-            min_y = min(pin.position.y_nm for pin in symbol.pins)
-            max_y = max(pin.position.y_nm for pin in symbol.pins)
-            
-            # Add some margin for symbol body
-            body_margin = 635000  # 0.635mm
-            bbox = BoundingBox(
-                top_left=Position(min_x - body_margin, min_y - body_margin),
-                bottom_right=Position(max_x + body_margin, max_y + body_margin),
-                symbol_id=symbol.id,
-                bbox_type=bbox_type
-            )
+        self.add_component_boundaries([symbol], bbox_type)
+    
+    def add_component_boundaries(self, symbols: List[Symbol],
+                                 bbox_type: BoundingBoxType = BoundingBoxType.BODY_PINS):
+        """
+        Add (or replace) the boundaries of several symbols at once, estimating
+        all of them in one vectorized pass. Same result as adding them one by one.
+        """
+        if not symbols:
+            return
+        bounds = _estimate_bounds(symbols)
+        
+        rows = np.empty(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            row = self._rows.get(symbol.id)
+            if row is None:
+                row = self._count
+                self._rows[symbol.id] = row
+                self._ids.append(symbol.id)
+                self._count += 1
+            rows[i] = row
         
-        self.component_boundaries[symbol.id] = bbox
+        if self._count > len(self._bbox_arr):
+            capacity = max(2 * len(self._bbox_arr), self._count)
+            self._bbox_arr = np.resize(self._bbox_arr, (capacity, 4))
+            self._types = np.resize(self._types, capacity)
+            self._centers = np.resize(self._centers, (capacity, 2))
+        
+        # A symbol listed twice keeps its last bounds, as with sequential adds
+        self._bbox_arr[rows] = bounds
+        self._types[rows] = _BBOX_TYPE_ORDINALS[bbox_type]
+        self._centers[rows, 0] = (bounds[:, 0] + bounds[:, 2]) >> 1
+        self._centers[rows, 1] = (bounds[:, 1] + bounds[:, 3]) >> 1
+        self._index_dirty = True
+        self._expanded = None
+    
+    def _boundary_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Return (ids, top_left, bottom_right) views of the live rows"""
+        live = self._bbox_arr[:self._count]
+        return self._ids, live[:, :2], live[:, 2:]
+    
+    def _expanded_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-left / bottom-right arrays grown by clearance_nm, cached until either changes"""
+        if self._expanded is None or self._expanded[0] != self.clearance_nm:
+            _, top_left, bottom_right = self._boundary_arrays()
+            self._expanded = (self.clearance_nm,
+                              top_left - self.clearance_nm,
+                              bottom_right + self.clearance_nm)
+        return self._expanded[1], self._expanded[2]
+    
+    def _query_index(self, min_x: int, min_y: int, max_x: int, max_y: int) -> np.ndarray:
+        """Indices (into the boundary arrays) of boxes overlapping the rectangle"""
+        if self._index_dirty:
+            self._index = STRIndex(self._bbox_arr[:self._count])
+            self._index_dirty = False
+        return self._index.query(min_x, min_y, max_x, max_y)
     
     def check_path_collision(self, path: RoutingPath, exclude_pins: Set[str] = None) -> CollisionResult:
         """
@@ -199,28 +376,57 @@ class ComponentBoundaryManager:
             exclude_pins: Pin IDs to exclude from collision (start/end pins)
         """
         exclude_pins = exclude_pins or set()
+        Position = _lazy_pos()
         colliding_components = []
         collision_points = []
         
-        for segment_start, segment_end in path.segments:
-            for symbol_id, bbox in self.component_boundaries.items():
+        ids = self._ids
+        clearance = self.clearance_nm
+        
+        if not path.segments or not ids:
+            return CollisionResult(False, [], [], clearance * 2)
+        
+        seg_xy = np.array([(s.x_nm, s.y_nm, e.x_nm, e.y_nm) for s, e in path.segments], dtype=np.int64)
+        seg_starts = seg_xy[:, :2]
+        seg_ends = seg_xy[:, 2:]
+        
+        # Only boxes whose clearance zone overlaps some segment's extent can collide
+        seg_min = np.minimum(seg_starts, seg_ends) - clearance
+        seg_max = np.maximum(seg_starts, seg_ends) + clearance
+        query = self._query_index
+        nearby = np.unique(np.concatenate([
+            query(x0, y0, x1, y1)
+            for (x0, y0), (x1, y1) in zip(seg_min.tolist(), seg_max.tolist())
+        ]))
+        if len(nearby) == 0:
+            return CollisionResult(False, [], [], clearance * 2)
+        
+        expanded_tl, expanded_br = self._expanded_arrays()
+        hits = _collide_segments_bboxes(seg_starts, seg_ends,
+                                        expanded_tl[nearby], expanded_br[nearby], 0)
+        
+        # Resolve ids / centers of the candidates once, outside the per-hit loop
+        nearby_ids = [ids[index] for index in nearby.tolist()]
+        nearby_centers = self._centers[nearby].tolist()
+        add_component = colliding_components.append
+        add_point = collision_points.append
+        
+        for segment_hits in hits:
+            for k in np.flatnonzero(segment_hits).tolist():
+                symbol_id = nearby_ids[k]
                 # Skip if this is one of our connection pins
                 if symbol_id in exclude_pins:
                     continue
-                    
-                # Expand bounding box by clearance margin
-                expanded_bbox = bbox.expand(self.clearance_nm)
-                
-                if expanded_bbox.intersects_line(segment_start, segment_end):
-                    colliding_components.append(symbol_id)
-                    # Approximate collision point as bbox center
-                    collision_points.append(bbox.center)
+                add_component(symbol_id)
+                # Approximate collision point as bbox center
+                center_x, center_y = nearby_centers[k]
+                add_point(Position(center_x, center_y))
         
         return CollisionResult(
             has_collision=len(colliding_components) > 0,
             colliding_components=list(set(colliding_components)),  # Remove duplicates
             collision_points=collision_points,
-            suggested_clearance=self.clearance_nm * 2  # Suggest double clearance
+            suggested_clearance=clearance * 2  # Suggest double clearance
         )
     
     def find_components_in_region(self, region_start: Position, region_end: Position) -> List[BoundingBox]:
@@ -231,23 +437,7 @@ class ComponentBoundaryManager:
         min_y = min(region_start.y_nm, region_end.y_nm)  
         max_y = max(region_start.y_nm, region_end.y_nm)
         
-        region_bbox = BoundingBox(
-            top_left=Position(min_x, min_y),
-            bottom_right=Position(max_x, max_y),
-            symbol_id="region",
-            bbox_type=BoundingBoxType.FULL
-        )
-        
-        overlapping_components = []
-        for bbox in self.component_boundaries.values():
-            # Check if bounding boxes overlap
-            if (bbox.top_left.x_nm <= region_bbox.bottom_right.x_nm and
-                bbox.bottom_right.x_nm >= region_bbox.top_left.x_nm and
-                bbox.top_left.y_nm <= region_bbox.bottom_right.y_nm and
-                bbox.bottom_right.y_nm >= region_bbox.top_left.y_nm):
-                overlapping_components.append(bbox)
-        
-        return overlapping_components
+        return [self._bbox_at(index) for index in self._query_index(min_x, min_y, max_x, max_y)]
     
     def suggest_detour_points(self, start: Position, end: Position, 
                             colliding_bbox: BoundingBox) -> List[Position]:
@@ -257,24 +447,24 @@ class ComponentBoundaryManager:
         This implements basic component avoidance by suggesting waypoints
         that route around the component boundary with proper clearance.
         """
+        Position = _lazy_pos()
         detour_points = []
         
         # Expand component boundary by clearance
         expanded = colliding_bbox.expand(self.clearance_nm)
         
         # Determine which side of component to route around based on start/end positions
-        start_to_component = colliding_bbox.center - start
-        end_to_component = colliding_bbox.center - end
+        center = colliding_bbox.center
         
         # Calculate detour points for top/bottom routing
-        if start.y_nm < colliding_bbox.center.y_nm and end.y_nm < colliding_bbox.center.y_nm:
+        if start.y_nm < center.y_nm and end.y_nm < center.y_nm:
             # Route above component
             detour_y = expanded.top_left.y_nm - self.clearance_nm
             detour_points = [
                 Position(start.x_nm, detour_y),
                 Position(end.x_nm, detour_y)
             ]
-        elif start.y_nm > colliding_bbox.center.y_nm and end.y_nm > colliding_bbox.center.y_nm:
+        elif start.y_nm > center.y_nm and end.y_nm > center.y_nm:
             # Route below component
             detour_y = expanded.bottom_right.y_nm + self.clearance_nm
             detour_points = [
@@ -283,7 +473,7 @@ class ComponentBoundaryManager:
             ]
         else:
             # Route around left or right side
-            if start.x_nm < colliding_bbox.center.x_nm:
+            if start.x_nm < center.x_nm:
                 # Route around left side
                 detour_x = expanded.top_left.x_nm - self.clearance_nm
                 detour_points = [
@@ -302,11 +492,11 @@ class ComponentBoundaryManager:
     
     def get_component_clearance_zone(self, symbol_id: str) -> Optional[BoundingBox]:
         """Get expanded clearance zone for a component"""
-        if symbol_id not in self.component_boundaries:
+        row = self._rows.get(symbol_id)
+        if row is None:
             return None
         
-        bbox = self.component_boundaries[symbol_id]
-        return bbox.expand(self.clearance_nm)
+        return self._bbox_at(row).expand(self.clearance_nm)
     
     def optimize_routing_corridor(self, start: Position, end: Position) -> Dict[str, Any]:
         """
@@ -318,11 +508,14 @@ class ComponentBoundaryManager:
         - Component clearance requirements
         """
         # Find components in the routing corridor
-        corridor_components = self.find_components_in_region(start, end)
+        corridor_rows = self._query_index(min(start.x_nm, end.x_nm), min(start.y_nm, end.y_nm),
+                                          max(start.x_nm, end.x_nm), max(start.y_nm, end.y_nm))
+        corridor_boxes = self._bbox_arr[corridor_rows]
         
         # Calculate corridor metrics
         corridor_length = start.distance_to(end)
-        obstacle_area = sum(bbox.width * bbox.height for bbox in corridor_components)
+        obstacle_area = int(((corridor_boxes[:, 2] - corridor_boxes[:, 0]) *
+                             (corridor_boxes[:, 3] - corridor_boxes[:, 1])).sum())
         corridor_area = abs(end.x_nm - start.x_nm) * abs(end.y_nm - start.y_nm)
         
         obstacle_density = obstacle_area / corridor_area if corridor_area > 0 else 0
@@ -337,11 +530,11 @@ class ComponentBoundaryManager:
         
         return {
             "corridor_length_nm": corridor_length,
-            "component_count": len(corridor_components),
+            "component_count": len(corridor_rows),
             "obstacle_density": obstacle_density,
             "suggested_strategy": strategy,
             "clearance_required_nm": self.clearance_nm,
-            "components_in_path": [bbox.symbol_id for bbox in corridor_components]
+            "components_in_path": [self._ids[row] for row in corridor_rows.tolist()]
         }
 
 
@@ -349,23 +542,21 @@ class AdvancedCollisionDetector:
     """
     Advanced collision detection for Phase 3+ implementation.
     
-    This class will implement sophisticated spatial algorithms for
-    high-performance collision detection in complex schematics.
+    Backed by the same packed R-tree as ComponentBoundaryManager, so
+    collision queries only visit components near the path.
     """
     
-    def __init__(self):
-        self.spatial_index = {}  # Future: R-tree or similar spatial index
+    def __init__(self, clearance_nm: int = 635000):
+        self.spatial_index = ComponentBoundaryManager(clearance_nm)
         
     def build_spatial_index(self, components: List[Symbol]):
         """Build spatial index for fast collision queries"""
-        # Future implementation: R-tree spatial indexing
-        # For now, simple dictionary indexing
-        pass
+        self.spatial_index = ComponentBoundaryManager(self.spatial_index.clearance_nm)
+        self.spatial_index.add_component_boundaries(components)
         
-    def fast_collision_check(self, path: RoutingPath) -> bool:
+    def fast_collision_check(self, path: RoutingPath, exclude_pins: Set[str] = None) -> bool:
         """Ultra-fast collision detection using spatial indexing"""
-        # Future implementation for large schematics
-        return False
+        return self.spatial_index.check_path_collision(path, exclude_pins).has_collision
 
 
 # Factory functions for integration
@@ -384,14 +575,11 @@ def integrate_with_kicad_api(symbols_data: List[Dict[str, Any]],
     """
     # Future integration with GetComponentBounds API
     # For now, use symbol pin data to estimate boundaries
-    for symbol_data in symbols_data:
-        # Convert to Symbol object (reuse from smart_routing module)
-        from .smart_routing import SmartRoutingMCPIntegration
-        integration = SmartRoutingMCPIntegration()
-        symbol = integration.convert_mcp_symbol_to_routing_symbol(symbol_data)
-        
-        # Add to boundary manager
-        boundary_manager.add_component_boundary(symbol)
+    # Convert to Symbol objects (reuse from smart_routing module)
+    from .smart_routing import SmartRoutingMCPIntegration
+    integration = SmartRoutingMCPIntegration()
+    
+    boundary_manager.add_component_boundaries(integration.convert_mcp_symbols_batch(symbols_data))
 
 
 # Example usage
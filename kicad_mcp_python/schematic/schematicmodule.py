@@ -1,28 +1,166 @@
-from mcp.server.fastmcp import FastMCP
+import logging
+import re
+import threading
+import time
+
 from kipy import KiCad
-from kipy.proto.common.types import base_types_pb2
+from kipy.errors import ConnectionError as KiCadConnectionError
 from kipy.proto.common.types.base_types_pb2 import DocumentType
 from kipy.proto.schematic import schematic_commands_pb2
+from kipy.proto.common.commands import editor_commands_pb2
+from google.protobuf.empty_pb2 import Empty
+from google.protobuf.internal import api_implementation
+
+logger = logging.getLogger(__name__)
+
+# An idle connection older than this is pinged before it is used again
+_KEEPALIVE_INTERVAL_S = 20.0
+# How long the active schematic's DocumentSpecifier is reused without asking KiCad
+_ACTIVE_DOC_TTL_S = 2.0
+# Resolved once so get_active_schematic_document doesn't walk the enum wrapper per call
+_DOCTYPE_SCHEMATIC = DocumentType.DOCTYPE_SCHEMATIC
+# Transport failures worth a reconnect; ApiError, ValueError and DecodeError are never retried
+_RETRYABLE_ERRORS = (KiCadConnectionError, OSError)
+# Request message prefixes that only read state and are safe to send twice; a
+# mutating command may have been applied before the connection dropped
+_READ_ONLY_PREFIXES = ("Get", "Search")
+
+
+# Response type expected for each schematic command
+_SCHEMATIC_RESPONSES = {
+    "DrawWire": schematic_commands_pb2.DrawWireResponse,
+    "GetSchematicInfo": schematic_commands_pb2.SchematicInfoResponse,
+    "GetSchematicItems": schematic_commands_pb2.GetSchematicItemsResponse,
+    "CreateSchematicItems": schematic_commands_pb2.CreateSchematicItemsResponse,
+    "GetSymbolPins": schematic_commands_pb2.GetSymbolPinsResponse,
+    "GetComponentBounds": schematic_commands_pb2.GetComponentBoundsResponse,
+    "GetGridAnchors": schematic_commands_pb2.GetGridAnchorsResponse,
+    "GetConnectionPoints": schematic_commands_pb2.GetConnectionPointsResponse,
+    # Selection Management System - Phase 1 Foundational Optimizations
+    "GetSelection": schematic_commands_pb2.SelectionResponse,
+    "AddToSelection": schematic_commands_pb2.SelectionResponse,
+    "RemoveFromSelection": schematic_commands_pb2.SelectionResponse,
+    "ClearSelection": Empty,
+    # Symbol Placement System - Phase 2 Symbol Placement
+    "PlaceSymbol": schematic_commands_pb2.PlaceSymbolResponse,
+    "GetSymbolLibraries": schematic_commands_pb2.GetSymbolLibrariesResponse,
+    "SearchSymbols": schematic_commands_pb2.SearchSymbolsResponse,
+    "PreloadSymbolLibraries": schematic_commands_pb2.PreloadSymbolLibrariesResponse,
+    "GetLibraryLoadStatus": schematic_commands_pb2.GetLibraryLoadStatusResponse,
+    "RefreshSymbolLibraries": schematic_commands_pb2.RefreshSymbolLibrariesResponse,
+}
+
+# Response type expected for each editor command
+_EDITOR_RESPONSES = {
+    "SaveDocument": Empty,
+    "DeleteItems": editor_commands_pb2.DeleteItemsResponse,
+}
+
+
+_protobuf_backend_checked = False
+
+
+def _check_protobuf_backend():
+    """Warns once if protobuf messages are decoded by the pure-Python runtime."""
+    global _protobuf_backend_checked
+    if _protobuf_backend_checked:
+        return
+    _protobuf_backend_checked = True
+    backend = api_implementation.Type()
+    if backend == "python":
+        logger.warning(
+            "protobuf is using the pure-Python implementation; IPC responses will decode slowly. "
+            "Install a protobuf wheel with the native (upb) backend and unset "
+            "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION."
+        )
+    else:
+        logger.debug("protobuf implementation: %s", backend)
+
 
 class SchematicTool:
     """
     Represents a schematic module with its properties and methods.
     """
 
+    # KiCad IPC client, created on first use
+    kicad = None
+    # Serializes connection setup; shared by all instances since tool classes don't chain __init__
+    _init_lock = threading.Lock()
+    # time.monotonic() of the last successful exchange with KiCad
+    _last_ping_ts = 0.0
+    # Last DocumentSpecifier returned by get_active_schematic_document, and when it was fetched
+    _active_doc_cache = None
+    _active_doc_cache_ts = 0.0
+    # GetLibraryLoadStatus has no fields, so one instance is shared by every status query
+    _GET_STATUS_REQ = schematic_commands_pb2.GetLibraryLoadStatus()
+
     def initialize_kicad(self):
         """
         Initialize KiCad IPC connection for schematic operations.
+        Does nothing if a connection has already been made.
+        """
+        if self.kicad is not None:
+            return
+        with self._init_lock:
+            # Another thread may have connected while we waited for the lock
+            if self.kicad is not None:
+                return
+            try:
+                # Initialize the KiCad client with IPC connection
+                # Use 60-second timeout to handle comprehensive library loading (like UI)
+                kicad = KiCad(timeout_ms=60000)
+                # Test connection with a ping before keeping the client
+                kicad.ping()
+                self._last_ping_ts = time.monotonic()
+                self.invalidate_active_document()
+                self.kicad = kicad
+                _check_protobuf_backend()
+                logger.debug("Successfully connected to KiCad IPC server")
+            except Exception as e:
+                raise RuntimeError(f"Failed to initialize KiCad for schematic operations: {str(e)}")
+    
+    def _ensure_connection(self):
         """
+        Makes sure self.kicad is usable. A connection that has been idle for a
+        while is pinged first, and replaced if KiCad no longer answers.
+        """
+        if self.kicad is None:
+            self.initialize_kicad()
+        elif time.monotonic() - self._last_ping_ts > _KEEPALIVE_INTERVAL_S and not self._ping():
+            self.kicad = None
+            self.initialize_kicad()
+
+    def _ping(self) -> bool:
         try:
-            # Initialize the KiCad client with IPC connection
-            # Use 60-second timeout to handle comprehensive library loading (like UI)
-            self.kicad = KiCad(timeout_ms=60000)
-            # Test connection with a ping
             self.kicad.ping()
-            print(f"Successfully connected to KiCad IPC server")
-        except Exception as e:
-            raise RuntimeError(f"Failed to initialize KiCad for schematic operations: {str(e)}")
-    
+        except Exception:
+            return False
+        self._last_ping_ts = time.monotonic()
+        return True
+
+    def _send(self, request, response_type):
+        """
+        Sends a request over the IPC client. If the send fails because the
+        connection dropped, reconnects; read-only requests are then retried
+        once, while mutating ones re-raise since KiCad may already have applied
+        them. Errors reported by KiCad or raised while decoding the reply
+        propagate immediately.
+        """
+        self._ensure_connection()
+        try:
+            response = self.kicad._client.send(request, response_type)
+        except _RETRYABLE_ERRORS:
+            # Still answering pings: the command itself failed (e.g. timed out), don't repeat it
+            if self._ping():
+                raise
+            self.kicad = None
+            self.initialize_kicad()
+            if not request.DESCRIPTOR.name.startswith(_READ_ONLY_PREFIXES):
+                raise
+            response = self.kicad._client.send(request, response_type)
+        self._last_ping_ts = time.monotonic()
+        return response
+
     def get_active_schematic_document(self):
         """
         Get the document specifier for the active schematic.
@@ -30,22 +168,32 @@ class SchematicTool:
         Returns:
             DocumentSpecifier for the current schematic, or None if unavailable
         """
+        if (self._active_doc_cache is not None
+                and time.monotonic() - self._active_doc_cache_ts < _ACTIVE_DOC_TTL_S):
+            return self._active_doc_cache
+        
         try:
-            if not hasattr(self, 'kicad'):
-                self.initialize_kicad()
+            self._ensure_connection()
             
             # Get open schematic documents from KiCad
-            docs = self.kicad.get_open_documents(DocumentType.DOCTYPE_SCHEMATIC)
+            docs = self.kicad.get_open_documents(_DOCTYPE_SCHEMATIC)
             if len(docs) > 0:
-                print(f"Found {len(docs)} open schematic document(s)")
-                return docs[0]  # Return the first open schematic
+                logger.debug("Found %d open schematic document(s)", len(docs))
+                self._active_doc_cache = docs[0]  # Return the first open schematic
+                self._active_doc_cache_ts = time.monotonic()
+                return self._active_doc_cache
             else:
-                print("Warning: No schematic documents are open in KiCad")
+                logger.warning("No schematic documents are open in KiCad")
                 return None  # Don't create fake document specifier
         except Exception as e:
-            print(f"Warning: Could not get schematic document specifier: {e}")
+            logger.warning("Could not get schematic document specifier: %s", e)
             return None
     
+    def invalidate_active_document(self):
+        """Forgets the cached active schematic so the next lookup asks KiCad again."""
+        self._active_doc_cache = None
+        self._active_doc_cache_ts = 0.0
+    
     def send_schematic_command(self, command_name: str, request):
         """
         Send a command to the KiCad schematic API using the proper IPC client.
@@ -58,74 +206,18 @@ class SchematicTool:
             Response from KiCad API
         """
         try:
-            if not hasattr(self, 'kicad'):
-                self.initialize_kicad()
+            try:
+                response_type = _SCHEMATIC_RESPONSES[command_name]
+            except KeyError:
+                raise ValueError(f"Unsupported schematic command: {command_name}")
             
             # Use the KiCad client's send method with the proper response type
-            if command_name == "DrawWire":
-                response = self.kicad._client.send(request, schematic_commands_pb2.DrawWireResponse)
-                return response
-            elif command_name == "GetSchematicInfo":
-                response = self.kicad._client.send(request, schematic_commands_pb2.SchematicInfoResponse)
-                return response
-            elif command_name == "GetSchematicItems":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetSchematicItemsResponse)
-                return response
-            elif command_name == "CreateSchematicItems":
-                response = self.kicad._client.send(request, schematic_commands_pb2.CreateSchematicItemsResponse)
-                return response
-            elif command_name == "GetSymbolPins":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetSymbolPinsResponse)
-                return response
-            elif command_name == "GetComponentBounds":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetComponentBoundsResponse)
-                return response
-            elif command_name == "GetGridAnchors":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetGridAnchorsResponse)
-                return response
-            elif command_name == "GetConnectionPoints":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetConnectionPointsResponse)
-                return response
-            # Selection Management System - Phase 1 Foundational Optimizations
-            elif command_name == "GetSelection":
-                response = self.kicad._client.send(request, schematic_commands_pb2.SelectionResponse)
-                return response
-            elif command_name == "AddToSelection":
-                response = self.kicad._client.send(request, schematic_commands_pb2.SelectionResponse)
-                return response
-            elif command_name == "RemoveFromSelection":
-                response = self.kicad._client.send(request, schematic_commands_pb2.SelectionResponse)
-                return response
-            elif command_name == "ClearSelection":
-                from google.protobuf.empty_pb2 import Empty
-                response = self.kicad._client.send(request, Empty)
-                return response
-            # Symbol Placement System - Phase 2 Symbol Placement
-            elif command_name == "PlaceSymbol":
-                response = self.kicad._client.send(request, schematic_commands_pb2.PlaceSymbolResponse)
-                return response
-            elif command_name == "GetSymbolLibraries":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetSymbolLibrariesResponse)
-                return response
-            elif command_name == "SearchSymbols":
-                response = self.kicad._client.send(request, schematic_commands_pb2.SearchSymbolsResponse)
-                return response
-            elif command_name == "PreloadSymbolLibraries":
-                response = self.kicad._client.send(request, schematic_commands_pb2.PreloadSymbolLibrariesResponse)
-                return response
-            elif command_name == "GetLibraryLoadStatus":
-                response = self.kicad._client.send(request, schematic_commands_pb2.GetLibraryLoadStatusResponse)
-                return response
-            elif command_name == "RefreshSymbolLibraries":
-                response = self.kicad._client.send(request, schematic_commands_pb2.RefreshSymbolLibrariesResponse)
-                return response
-            else:
-                raise ValueError(f"Unsupported schematic command: {command_name}")
+            return self._send(request, response_type)
                 
         except Exception as e:
-            print(f"Error sending schematic command {command_name}: {e}")
+            logger.warning("Error sending schematic command %s: %s", command_name, e)
             # Don't return mock responses - let the error propagate to show real connection issues
-            raise e
+            raise
     
     def send_editor_command(self, command_name: str, request):
         """
@@ -139,33 +231,27 @@ class SchematicTool:
             Response from KiCad API
         """
         try:
-            if not hasattr(self, 'kicad'):
-                self.initialize_kicad()
-            
-            # Import editor command response types
-            from kipy.proto.common.commands import editor_commands_pb2
-            from google.protobuf.empty_pb2 import Empty
+            try:
+                response_type = _EDITOR_RESPONSES[command_name]
+            except KeyError:
+                raise ValueError(f"Unsupported editor command: {command_name}")
             
             # Use the KiCad client's send method with the proper response type
+            response = self._send(request, response_type)
             if command_name == "SaveDocument":
-                # SaveDocument returns Empty response type
-                response = self.kicad._client.send(request, Empty)  
-                return response
-            elif command_name == "DeleteItems":
-                response = self.kicad._client.send(request, editor_commands_pb2.DeleteItemsResponse)
-                return response
-            else:
-                raise ValueError(f"Unsupported editor command: {command_name}")
+                # Saving may rename the document the cached specifier points at
+                self.invalidate_active_document()
+            return response
                 
         except Exception as e:
-            print(f"Error sending editor command {command_name}: {e}")
+            logger.warning("Error sending editor command %s: %s", command_name, e)
             # Let the error propagate to show real connection issues
-            raise e
+            raise
 
     def manage_symbol_libraries(
         self,
         mode: str = "status",
-        library_names: list[str] = [],
+        library_names: list[str] | None = None,
         force_reload: bool = False
     ) -> dict:
         """
@@ -179,22 +265,25 @@ class SchematicTool:
                 - "load": Comprehensive library loading (like first symbol button press)
                 - "status": Check which libraries are currently loaded
                 - "refresh": Refresh externally modified libraries
-            library_names: Specific libraries to target (empty = all libraries)
+            library_names: Specific libraries to target (None or empty = all libraries)
             force_reload: Force reload even if already loaded (optional, no artificial limits)
 
         Returns:
             Dictionary with operation results, statistics, and timing
         """
+        library_names = library_names or ()
         try:
             if mode == "load":
                 # Comprehensive loading - matches UI behavior when pressing symbol button first time
                 request = schematic_commands_pb2.PreloadSymbolLibraries()
-                for lib_name in library_names:
-                    request.library_names.append(lib_name)
+                if library_names:
+                    request.library_names.extend(library_names)
                 request.force_reload = force_reload
 
-                response = self.send_schematic_command("PreloadSymbolLibraries", request)
+                response = self.send_preload_symbol_libraries(request)
 
+                # This dict is the tool result FastMCP serializes, so repeated fields
+                # are copied to lists here; protobuf containers would be stringified.
                 result = {
                     "mode": "load",
                     "operation": "Comprehensive library loading (UI-matching behavior)",
@@ -211,8 +300,7 @@ class SchematicTool:
 
             elif mode == "status":
                 # Check current library loading status
-                request = schematic_commands_pb2.GetLibraryLoadStatus()
-                response = self.send_schematic_command("GetLibraryLoadStatus", request)
+                response = self.send_get_library_load_status(SchematicTool._GET_STATUS_REQ)
 
                 return {
                     "mode": "status",
@@ -227,10 +315,10 @@ class SchematicTool:
             elif mode == "refresh":
                 # Refresh libraries to pick up external changes
                 request = schematic_commands_pb2.RefreshSymbolLibraries()
-                for lib_name in library_names:
-                    request.library_names.append(lib_name)
+                if library_names:
+                    request.library_names.extend(library_names)
 
-                response = self.send_schematic_command("RefreshSymbolLibraries", request)
+                response = self.send_refresh_symbol_libraries(request)
 
                 result = {
                     "mode": "refresh",
@@ -249,4 +337,31 @@ class SchematicTool:
                 return {"error": f"Invalid mode '{mode}'. Use 'load', 'status', or 'refresh'"}
 
         except Exception as e:
-            return {"error": f"Failed to manage libraries (mode: {mode}): {e}"}
\ No newline at end of file
+            return {"error": f"Failed to manage libraries (mode: {mode}): {e}"}
+
+
+def _snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _make_sender(command_name: str, response_type):
+    def sender(self, request):
+        try:
+            return self._send(request, response_type)
+        except Exception as e:
+            logger.warning("Error sending schematic command %s: %s", command_name, e)
+            # Let the error propagate to show real connection issues
+            raise
+
+    sender.__name__ = f"send_{_snake(command_name)}"
+    sender.__qualname__ = f"SchematicTool.{sender.__name__}"
+    sender.__doc__ = f"Send a {command_name} request to the KiCad schematic API."
+    return sender
+
+
+# One method per schematic command (send_draw_wire, send_get_selection, ...), so callers
+# that know the command skip send_schematic_command's name lookup
+for _command_name, _response_type in _SCHEMATIC_RESPONSES.items():
+    _sender = _make_sender(_command_name, _response_type)
+    setattr(SchematicTool, _sender.__name__, _sender)
+del _command_name, _response_type, _sender
@@ -17,10 +17,21 @@ Phase 3: Component Avoidance
 Phase 4: Advanced Features
 """
 
-from typing import List, Dict, Tuple, Optional, Any
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Optional, Any, NamedTuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+import hashlib
+import logging
 import math
+import struct
+
+import numpy as np
+
+from .spatial_index import STRIndex
+
+logger = logging.getLogger(__name__)
 
 
 class RoutingMode(Enum):
@@ -40,7 +51,7 @@ class AnchorType(Enum):
     JUNCTION = "junction"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     """Position in nanometers (KiCad API coordinate system)"""
     x_nm: int
@@ -54,16 +65,25 @@ class Position:
     
     def distance_to(self, other: 'Position') -> float:
         """Calculate Euclidean distance to another position"""
+        # hypot stays accurate where dx*dx + dy*dy no longer fits a float exactly
+        return math.hypot(self.x_nm - other.x_nm, self.y_nm - other.y_nm)
+    
+    def distance_sq_to(self, other: 'Position') -> int:
+        """Squared Euclidean distance; use for comparisons where the root isn't needed"""
         dx = self.x_nm - other.x_nm
         dy = self.y_nm - other.y_nm
-        return math.sqrt(dx * dx + dy * dy)
+        return dx * dx + dy * dy
     
     def manhattan_distance_to(self, other: 'Position') -> int:
         """Calculate Manhattan distance (L1 norm) to another position"""
         return abs(self.x_nm - other.x_nm) + abs(self.y_nm - other.y_nm)
 
 
-@dataclass
+# Approach angle per pin orientation (0=East, 1=North, 2=West, 3=South): the opposite direction
+_APPROACH_ANGLES: tuple[int, ...] = (180, 270, 0, 90)
+
+
+@dataclass(slots=True)
 class Pin:
     """Schematic pin with routing information"""
     id: str
@@ -77,15 +97,15 @@ class Pin:
     
     def get_approach_angle(self) -> int:
         """Get optimal approach angle based on pin orientation"""
-        approach_angles = {0: 180, 1: 270, 2: 0, 3: 90}  # Opposite direction
-        return approach_angles.get(self.orientation, 0)
+        orientation = self.orientation
+        return _APPROACH_ANGLES[orientation] if 0 <= orientation < 4 else 0
     
     def get_connection_point(self) -> Position:
         """Get the precise connection point at pin end"""
         return self.position  # For now, use pin position directly
 
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
     """Schematic symbol with routing context"""
     id: str
@@ -94,10 +114,10 @@ class Symbol:
     position: Position
     orientation_degrees: float
     pins: List[Pin]
-    bounding_box: Optional[Tuple[Position, Position]] = None  # (top_left, bottom_right)
+    bbox: Optional[Tuple[int, int, int, int]] = None  # (min_x, min_y, max_x, max_y) in nm
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingAnchor:
     """Snap point for intelligent routing"""
     position: Position
@@ -105,17 +125,383 @@ class RoutingAnchor:
     item_id: Optional[str] = None
     distance: float = 0.0
     priority: int = 0  # Lower = higher priority
+    distance_sq: int = 0  # Exact squared distance in nm^2; what ranking compares
+
+
+# (prefer_horizontal, prefer_vertical) by [start orientation][end orientation], for pins that
+# aren't aligned. Orientation: 0=East, 1=North, 2=West, 3=South.
+# Both horizontal (E/W) -> vertical first; both vertical (N/S) -> horizontal first;
+# mixed -> no preference, KiCad's distance-based choice applies.
+_ORIENTATION_PREFERENCES: tuple[tuple[tuple[bool, bool], ...], ...] = tuple(
+    tuple(
+        (False, True) if start % 2 == 0 and end % 2 == 0
+        else (True, False) if start % 2 == 1 and end % 2 == 1
+        else (False, False)
+        for end in range(4)
+    )
+    for start in range(4)
+)
+
+_ORIENTATION_PREFERENCE_ARRAY = np.array(_ORIENTATION_PREFERENCES, dtype=bool)  # (4, 4, 2)
+
+# Anchor priorities (lower wins). Anchors are ranked in priority buckets, each
+# bucket ordered by distance, so priorities are never compared per anchor.
+_PIN_ANCHOR_PRIORITY = 1  # Pins have highest priority
+_GRID_ANCHOR_PRIORITY = 10
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutingPath:
     """Complete routing path with segments"""
     start_pin: Pin
     end_pin: Pin
     segments: List[Tuple[Position, Position]]
-    total_length: float
+    total_length: float  # nm; an exact int for Manhattan paths
     mode: RoutingMode
     quality_score: float = 0.0  # Higher = better routing
+    bus_used: Optional[str] = None  # id of the existing wire a bus-aware path runs along
+
+
+# Wires shorter than this are never treated as buses (5mm)
+_MIN_BUS_LENGTH_NM = 5000000
+# Hashed per bus candidate: its length, axis flag and endpoints (followed by its id)
+_BUS_DIGEST_RECORD = struct.Struct('<d?4q')
+
+# One bus candidate per record: the fixed coordinate (Y of a horizontal bus, X of a
+# vertical one), the extent along the bus, the wire length and the axis
+BUS_DTYPE = np.dtype([
+    ('coord', 'i8'), ('range_start', 'i8'), ('range_end', 'i8'),
+    ('length_nm', 'f8'), ('vertical', '?'),
+])
+_NO_BUSES = np.empty(0, dtype=BUS_DTYPE)
+_NO_BUSES.flags.writeable = False
+
+
+@dataclass(slots=True)
+class BusCandidateSet:
+    """
+    Existing wires that can serve as buses, longest first. Built once from the
+    wire list (see from_wires) and passed to bus-aware routing in place of it,
+    so routing many pin pairs over the same wires filters and hashes them once.
+    """
+    ids: List[str]  # Wire id of each record
+    records: np.ndarray  # BUS_DTYPE
+    digest: bytes  # Identifies the candidates, for route caching
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def from_wires(cls, existing_wires: List[dict]) -> 'BusCandidateSet':
+        """Axis-aligned electrical wires of at least _MIN_BUS_LENGTH_NM, in one pass"""
+        ids = []
+        rows = []
+        digest = hashlib.blake2b(digest_size=16)
+        pack = _BUS_DIGEST_RECORD.pack
+        
+        for wire in existing_wires:
+            # Only consider electrical wires (not graphical lines)
+            if wire.get('layer_type') != 'WIRE':
+                continue
+            
+            length = wire.get('length_nm', 0)
+            if length < _MIN_BUS_LENGTH_NM:
+                continue
+            
+            # Check if wire is axis-aligned (horizontal or vertical)
+            is_horizontal = bool(wire.get('is_horizontal'))
+            if not is_horizontal and not wire.get('is_vertical'):
+                continue
+            
+            start = wire['start']
+            end = wire['end']
+            sx, sy, ex, ey = start['x_nm'], start['y_nm'], end['x_nm'], end['y_nm']
+            if is_horizontal:
+                # Y-coordinate of horizontal bus, spanning the wire's X range
+                rows.append((sy, min(sx, ex), max(sx, ex), length, False))
+            else:
+                # X-coordinate of vertical bus, spanning the wire's Y range
+                rows.append((sx, min(sy, ey), max(sy, ey), length, True))
+            wire_id = wire['id']
+            ids.append(wire_id)
+            
+            # Hashed in input order: it decides between buses of equal length
+            digest.update(pack(length, not is_horizontal, sx, sy, ex, ey))
+            digest.update(str(wire_id).encode())
+            digest.update(b'\0')
+        
+        if not rows:
+            return cls([], _NO_BUSES, digest.digest())
+        records = np.array(rows, dtype=BUS_DTYPE)
+        # Sort buses by length, longest first (longer buses are more attractive for routing);
+        # the stable sort keeps equally long buses in input order
+        order = np.argsort(-records['length_nm'], kind='stable')
+        return cls([ids[i] for i in order.tolist()], records[order], digest.digest())
+
+
+# One wire segment per record: endpoints in nm, routing mode as an index into
+# _ROUTING_MODES, and the segment's index within its path
+WIRE_DTYPE = np.dtype([
+    ('sx', 'i8'), ('sy', 'i8'), ('ex', 'i8'), ('ey', 'i8'),
+    ('mode', 'u1'), ('idx', 'i4'),
+])
+_ROUTING_MODES = tuple(RoutingMode)
+_ROUTING_MODE_CODES = {mode: code for code, mode in enumerate(_ROUTING_MODES)}
+
+
+# Mode codes understood by _break_point_xy (anything that isn't 45-degree breaks like Manhattan);
+# direct routes have no break point and never reach it
+_MODE_MANHATTAN = 0
+_MODE_ANGLE_45 = 1
+_MODE_DIRECT = 2
+
+# RoutingMode -> mode code, resolved once at the API boundary
+_BREAK_POINT_MODES = {
+    RoutingMode.MANHATTAN: _MODE_MANHATTAN,
+    RoutingMode.DIRECT: _MODE_DIRECT,
+    RoutingMode.FREE: _MODE_MANHATTAN,
+    RoutingMode.ANGLE_45: _MODE_ANGLE_45,
+}
+
+
+def _break_point_xy(sx, sy, ex, ey, mode, prefer_horizontal, prefer_vertical):
+    """
+    Integer core of SmartRoutingEngine.compute_break_point: returns the
+    (x, y) break point between (sx, sy) and (ex, ey). Works on plain ints
+    only, so no Position objects or closures are created per call.
+    """
+    dx = ex - sx
+    dy = ey - sy
+    adx = abs(dx)
+    ady = abs(dy)
+    
+    # Preferences win; otherwise break along the longer axis like KiCad
+    vertical = prefer_vertical or (not prefer_horizontal and adx < ady)
+    
+    if mode != _MODE_ANGLE_45:
+        if vertical:
+            return sx, ey
+        return ex, sy
+    
+    x_dir = 1 if dx > 0 else -1
+    y_dir = 1 if dy > 0 else -1
+    if vertical:
+        mx, my = sx, ey - y_dir * adx
+    else:
+        mx, my = ex - x_dir * ady, sy
+    
+    # A diagonal that would run backwards falls back to the distance-based choice.
+    # Without a preference that choice was already made above, so only a
+    # preferred direction can need it.
+    if (prefer_horizontal or prefer_vertical) and (
+            ((mx - sx > 0) != (dx > 0)) or ((my - sy > 0) != (dy > 0))):
+        if adx < ady:
+            mx, my = sx, ey - y_dir * adx
+        else:
+            mx, my = ex - x_dir * ady, sy
+    return mx, my
+
+
+@lru_cache(maxsize=4096)
+def _cached_break_point(sx, sy, ex, ey, mode, prefer_horizontal, prefer_vertical) -> Position:
+    """
+    _break_point_xy wrapped in a Position, memoized: re-routing the same pin
+    pairs is common. Position is frozen, so handing out the cached instance is safe.
+    """
+    return Position(*_break_point_xy(sx, sy, ex, ey, mode, prefer_horizontal, prefer_vertical))
+
+
+class _ManhattanLeg(NamedTuple):
+    """The pin-independent part of a Manhattan RoutingPath"""
+    break_point: Position
+    total_length: int
+    quality_score: float
+
+
+@lru_cache(maxsize=2048)
+def _cached_manhattan_leg(sx, sy, ex, ey, prefer_horizontal, prefer_vertical) -> _ManhattanLeg:
+    """
+    Break point, length and score of the L-path from (sx, sy) to (ex, ey), memoized.
+    RoutingPath itself isn't cached: callers adjust its segments and pins afterwards.
+    """
+    # Both legs are axis-aligned, so the L-shape's length is the L1 distance
+    total_length = abs(ex - sx) + abs(ey - sy)
+    return _ManhattanLeg(
+        _cached_break_point(sx, sy, ex, ey, _MODE_MANHATTAN, prefer_horizontal, prefer_vertical),
+        total_length,
+        # Lower length = higher score
+        1000000.0 / (total_length + 1.0),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _grid_position(x_nm: int, y_nm: int) -> Position:
+    """
+    Interned Position for a grid point: anchor queries while dragging keep
+    snapping to the same few points, and a frozen Position is safe to share.
+    """
+    return Position(x_nm, y_nm)
+
+
+def _straight_path(start_pin: Pin, end_pin: Pin, start_pos: Position, end_pos: Position) -> RoutingPath:
+    """Single-segment Manhattan path between connection points that share an x or a y"""
+    total_length = abs(end_pos.x_nm - start_pos.x_nm) + abs(end_pos.y_nm - start_pos.y_nm)
+    return RoutingPath(
+        start_pin=start_pin,
+        end_pin=end_pin,
+        segments=[(start_pos, end_pos)],
+        total_length=total_length,
+        mode=RoutingMode.MANHATTAN,
+        # Lower length = higher score
+        quality_score=1000000.0 / (total_length + 1.0)
+    )
+
+
+def _aabb_overlap(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+    """Edge-inclusive box overlap; x is tested first so most misses exit after two compares"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _axis_segment_vs_aabb(x0: int, y0: int, x1: int, y1: int, bb: Tuple[int, int, int, int]) -> bool:
+    """
+    Edge-inclusive hit test of a horizontal or vertical segment against a box:
+    one range check on the fixed coordinate, one interval overlap on the other.
+    Segments that are neither fall back to the (conservative) AABB overlap.
+    """
+    min_x, min_y, max_x, max_y = bb
+    if y0 == y1:
+        return min_y <= y0 <= max_y and max(x0, x1) >= min_x and min(x0, x1) <= max_x
+    if x0 == x1:
+        return min_x <= x0 <= max_x and max(y0, y1) >= min_y and min(y0, y1) <= max_y
+    return _aabb_overlap((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)), bb)
+
+
+def _segments_hit_aabbs(segments: List[Tuple[Position, Position]],
+                        boxes: List[Tuple[int, int, int, int]]) -> bool:
+    """Whether any (Manhattan) segment touches any box"""
+    for start, end in segments:
+        x0, y0, x1, y1 = start.x_nm, start.y_nm, end.x_nm, end.y_nm
+        for box in boxes:
+            if _axis_segment_vs_aabb(x0, y0, x1, y1, box):
+                return True
+    return False
+
+
+# Below this many bus structures the per-bus loop beats building and scoring arrays
+_VECTOR_BUS_SCORING_MIN = 16
+# batch_route scores pin pairs against buses in chunks of at most this many (pair, bus) cells
+_BATCH_BUS_CELLS = 1 << 20
+# A pin within this distance of a horizontal bus's Y connects straight across (0.1mm)
+_BUS_ALIGN_TOLERANCE_NM = 100000
+
+
+def _bus_connection_points(sx: int, sy: int, ex: int, ey: int, vertical: np.ndarray,
+                           coord: np.ndarray, range_start: np.ndarray, range_end: np.ndarray):
+    """
+    SmartRoutingEngine._find_optimal_bus_connection_point for every bus at once.
+    Returns the connection x, y and the start -> bus -> end length of each bus.
+    """
+    # Horizontal buses: connect at an aligned pin's X, else halfway between the pins
+    hx = np.where(np.abs(sy - coord) < _BUS_ALIGN_TOLERANCE_NM, sx,
+                  np.where(np.abs(ey - coord) < _BUS_ALIGN_TOLERANCE_NM, ex, (sx + ex) // 2))
+    # Vertical buses: whichever of the two pins' Y levels gives the shorter path
+    y1 = np.clip(sy, range_start, range_end)
+    y2 = np.clip(ey, range_start, range_end)
+    y1_length = np.hypot(sx - coord, sy - y1) + np.hypot(coord - ex, y1 - ey)
+    y2_length = np.hypot(sx - coord, sy - y2) + np.hypot(coord - ex, y2 - ey)
+    
+    cx = np.where(vertical, coord, np.clip(hx, range_start, range_end))
+    cy = np.where(vertical, np.where(y1_length <= y2_length, y1, y2), coord)
+    return cx, cy, np.hypot(sx - cx, sy - cy) + np.hypot(cx - ex, cy - ey)
+
+
+def _bus_path(start_pos: Position, connection_point: Position, end_pos: Position,
+              total_length: float, bus_id: str) -> RoutingPath:
+    """Multi-hop Manhattan path start -> bus connection point -> end, pins left unset"""
+    segments = []
+    
+    # First leg: route from start to bus connection point
+    # This should be a Manhattan path, not diagonal
+    if start_pos.x_nm != connection_point.x_nm and start_pos.y_nm != connection_point.y_nm:
+        # Need L-shaped path to reach bus
+        # Prefer horizontal-first routing for cleaner schematics
+        intermediate = Position(connection_point.x_nm, start_pos.y_nm)
+        segments.append((start_pos, intermediate))  # Horizontal segment
+        segments.append((intermediate, connection_point))  # Vertical segment to bus
+    else:
+        # Already aligned - single segment
+        segments.append((start_pos, connection_point))
+    
+    # Second leg: from bus connection to destination
+    # The bus itself provides the connection, we just need the final segment
+    if connection_point.x_nm != end_pos.x_nm or connection_point.y_nm != end_pos.y_nm:
+        # Only add segment if not already at destination
+        segments.append((connection_point, end_pos))
+    
+    return RoutingPath(
+        start_pin=None,  # Will be set by caller
+        end_pin=None,    # Will be set by caller
+        segments=segments,
+        total_length=total_length,
+        mode=RoutingMode.MANHATTAN,
+        quality_score=1000000.0 / (total_length + 1.0),
+        bus_used=bus_id  # Track which bus was used
+    )
+
+
+# Bus-aware routes remembered per engine, keyed by _route_key
+_ROUTE_CACHE_SIZE = 4096
+# Route key prefix: pin connection points, orientations and grid size
+_ROUTE_KEY_PINS = struct.Struct('<4q2iq')
+
+
+def _route_key(start_pin: Pin, end_pin: Pin, grid_size_nm: int, buses: 'BusCandidateSet') -> bytes:
+    """
+    Digest of everything generate_bus_aware_manhattan_path's result depends on.
+    Obstacles are not part of the key: neither the direct nor the bus path
+    consults them.
+    """
+    start = start_pin.get_connection_point()
+    end = end_pin.get_connection_point()
+    return hashlib.blake2b(
+        _ROUTE_KEY_PINS.pack(start.x_nm, start.y_nm, end.x_nm, end.y_nm,
+                             start_pin.orientation, end_pin.orientation, grid_size_nm) + buses.digest,
+        digest_size=16,
+    ).digest()
+
+
+_numba_route_kernel = None
+_numba_checked = False
+
+
+def _load_numba_route_kernel():
+    """Compiled batch routing kernel, or None when numba is not installed"""
+    global _numba_route_kernel, _numba_checked
+    if not _numba_checked:
+        _numba_checked = True
+        try:
+            from ._routing_kernels import route_manhattan_batch
+            _numba_route_kernel = route_manhattan_batch
+        except ImportError:
+            _numba_route_kernel = None
+    return _numba_route_kernel
+
+
+_numba_bus_kernel = None
+_numba_bus_checked = False
+
+
+def _load_numba_bus_kernel():
+    """Compiled batch bus scoring kernel, or None when numba is not installed"""
+    global _numba_bus_kernel, _numba_bus_checked
+    if not _numba_bus_checked:
+        _numba_bus_checked = True
+        try:
+            from ._routing_kernels import best_bus_connections
+            _numba_bus_kernel = best_bus_connections
+        except ImportError:
+            _numba_bus_kernel = None
+    return _numba_bus_kernel
 
 
 class SmartRoutingEngine:
@@ -131,6 +517,32 @@ class SmartRoutingEngine:
     def __init__(self):
         self.grid_size_nm = 1270000  # 1.27mm = 50 mils in nanometers
         self.snap_range_nm = 635000  # 0.635mm = 25 mils snap range
+        # Flattened pins of the last symbols list seen by find_routing_anchors
+        self._pin_cache_symbols = None
+        self._pin_cache_len = 0
+        self._pins: List[Pin] = []
+        self._pin_xy = np.empty((0, 2), dtype=np.int64)
+        # Uniform grid over _pin_xy: (cell_x, cell_y) -> pin indices, cells one snap range wide
+        self._pin_cells: Dict[Tuple[int, int], np.ndarray] = {}
+        self._pin_cell_size = 0
+        # Packed R-tree over the symbol bounding boxes of the last symbols list
+        # seen by route_wire_with_avoidance, with each box's reference and extents
+        self._obstacle_cache_symbols = None
+        self._obstacle_cache_len = 0
+        self._obstacle_index = STRIndex(np.empty((0, 4), dtype=np.int64))
+        self._obstacle_refs: List[str] = []
+        self._obstacle_boxes: List[Tuple[int, int, int, int]] = []
+        # Least recently used first: _route_key digest -> bus-aware RoutingPath
+        self._route_cache: OrderedDict[bytes, RoutingPath] = OrderedDict()
+        
+    @property
+    def snap_range_nm(self) -> int:
+        return self._snap_range_nm
+    
+    @snap_range_nm.setter
+    def snap_range_nm(self, value: int):
+        self._snap_range_nm = value
+        self._snap_range_sq = value * value
         
     def compute_break_point(self, start: Position, end: Position, 
                           mode: RoutingMode = RoutingMode.MANHATTAN,
@@ -152,81 +564,17 @@ class SmartRoutingEngine:
         Returns:
             Optimal break point for two-segment routing
         """
-        delta = end - start
-        x_dir = 1 if delta.x_nm > 0 else -1
-        y_dir = 1 if delta.y_nm > 0 else -1
-        
-        if mode == RoutingMode.DIRECT:
+        mode_code = _BREAK_POINT_MODES[mode]
+        if mode_code == _MODE_DIRECT:
             # Direct routing - no break point needed
             return end
-            
-        # Initialize midpoint
-        midpoint = Position(0, 0)
-        
-        # Define breakVertical lambda equivalent
-        def break_vertical():
-            nonlocal midpoint
-            if mode == RoutingMode.ANGLE_45:
-                # 45-degree routing vertical break
-                midpoint.x_nm = start.x_nm
-                midpoint.y_nm = end.y_nm - y_dir * abs(delta.x_nm)
-            else:
-                # Manhattan vertical break
-                midpoint.x_nm = start.x_nm
-                midpoint.y_nm = end.y_nm
-        
-        # Define breakHorizontal lambda equivalent  
-        def break_horizontal():
-            nonlocal midpoint
-            if mode == RoutingMode.ANGLE_45:
-                # 45-degree routing horizontal break
-                midpoint.x_nm = end.x_nm - x_dir * abs(delta.y_nm)
-                midpoint.y_nm = start.y_nm
-            else:
-                # Manhattan horizontal break
-                midpoint.x_nm = end.x_nm
-                midpoint.y_nm = start.y_nm
-        
-        # Apply KiCad's preference logic
-        if prefer_vertical:
-            break_vertical()
-        elif prefer_horizontal:
-            break_horizontal()
-        else:
-            # KiCad's default logic: choose based on smaller dimension
-            if abs(delta.x_nm) < abs(delta.y_nm):
-                break_vertical()
-            else:
-                break_horizontal()
-        
-        # For 45-degree mode, check if we need to adjust based on direction
-        if mode == RoutingMode.ANGLE_45:
-            delta_midpoint = midpoint - start
-            
-            # Check for invalid 45-degree configurations and fall back to distance-based
-            if ((delta_midpoint.x_nm > 0) != (delta.x_nm > 0)) or \
-               ((delta_midpoint.y_nm > 0) != (delta.y_nm > 0)):
-                # Reset preferences and use distance-based selection
-                prefer_vertical = False
-                prefer_horizontal = False
-                
-                if abs(delta.x_nm) < abs(delta.y_nm):
-                    break_vertical()
-                else:
-                    break_horizontal()
         
-        # Final fallback - if no preferences set, use distance-based
-        if not prefer_horizontal and not prefer_vertical:
-            if abs(delta.x_nm) < abs(delta.y_nm):
-                break_vertical() 
-            else:
-                break_horizontal()
-                
-        return midpoint
+        return _cached_break_point(start.x_nm, start.y_nm, end.x_nm, end.y_nm, mode_code,
+                                   bool(prefer_horizontal), bool(prefer_vertical))
     
     def generate_bus_aware_manhattan_path(self, start_pin: Pin, end_pin: Pin,
                                         avoid_components: List[Symbol] = None,
-                                        existing_wires: List[dict] = None) -> RoutingPath:
+                                        existing_wires: 'List[dict] | BusCandidateSet' = None) -> RoutingPath:
         """
         Generate bus-aware Manhattan routing path that considers existing wire structures.
 
@@ -237,29 +585,64 @@ class SmartRoutingEngine:
             start_pin: Starting pin for routing
             end_pin: Ending pin for routing
             avoid_components: Components to route around
-            existing_wires: Existing wire structures from schematic
+            existing_wires: Existing wire structures from schematic, or a BusCandidateSet
+                built from them once for many routes
 
         Returns:
             Optimized routing path considering bus structures
         """
         avoid_components = avoid_components or []
-        existing_wires = existing_wires or []
+        buses = self._analyze_bus_structures(existing_wires or [])
+
+        # Re-routing the same pins over the same wires is common while iterating.
+        # A hit would skip the routing trace, so callers capturing DEBUG output
+        # always get a fresh route (which still refreshes the cache).
+        key = _route_key(start_pin, end_pin, self.grid_size_nm, buses)
+        cache = self._route_cache
+        cached = None if logger.isEnabledFor(logging.DEBUG) else cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+        else:
+            cached = self._compute_bus_aware_path(start_pin, end_pin, avoid_components, buses)
+            cache[key] = cached
+            cache.move_to_end(key)
+            if len(cache) > _ROUTE_CACHE_SIZE:
+                cache.popitem(last=False)
+        
+        # Callers adjust the path they get back, so each call gets its own copy
+        return RoutingPath(
+            start_pin=start_pin,
+            end_pin=end_pin,
+            segments=list(cached.segments),
+            total_length=cached.total_length,
+            mode=cached.mode,
+            quality_score=cached.quality_score,
+            bus_used=cached.bus_used
+        )
 
-        # DEBUG: Bus-aware routing entry point
-        print(f"DEBUG BUS-AWARE ROUTING:")
-        print(f"  Start pin: {start_pin.symbol_reference}.{start_pin.number} at ({start_pin.position.x_nm/1000000:.2f}, {start_pin.position.y_nm/1000000:.2f})")
-        print(f"  End pin: {end_pin.symbol_reference}.{end_pin.number} at ({end_pin.position.x_nm/1000000:.2f}, {end_pin.position.y_nm/1000000:.2f})")
-        print(f"  Existing wires: {len(existing_wires)}")
+    def _compute_bus_aware_path(self, start_pin: Pin, end_pin: Pin, avoid_components: List[Symbol],
+                                bus_structures: BusCandidateSet) -> RoutingPath:
+        """generate_bus_aware_manhattan_path without the route cache"""
+        # Debug tracing is only formatted when DEBUG logging is on
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("BUS-AWARE ROUTING:")
+            logger.debug("  Start pin: %s.%s at (%.2f, %.2f)", start_pin.symbol_reference, start_pin.number,
+                         start_pin.position.x_nm / 1000000, start_pin.position.y_nm / 1000000)
+            logger.debug("  End pin: %s.%s at (%.2f, %.2f)", end_pin.symbol_reference, end_pin.number,
+                         end_pin.position.x_nm / 1000000, end_pin.position.y_nm / 1000000)
 
         # Get connection points
         start_pos = start_pin.get_connection_point()
         end_pos = end_pin.get_connection_point()
 
-        # Analyze existing wires for bus structures
-        bus_structures = self._analyze_bus_structures(existing_wires)
-        print(f"DEBUG: Found {len(bus_structures)} bus structures")
-        for bus in bus_structures:
-            print(f"  Bus {bus['id']}: {bus['type']} at {bus['coordinate']/1000000:.2f}mm, range {bus['range_start']/1000000:.2f}-{bus['range_end']/1000000:.2f}mm")
+        if debug:
+            logger.debug("Found %d bus structures", len(bus_structures))
+            for wire_id, (coord, range_start, range_end, _, vertical) in zip(
+                    bus_structures.ids, bus_structures.records.tolist()):
+                logger.debug("  Bus %s: %s at %.2fmm, range %.2f-%.2fmm", wire_id,
+                             'vertical' if vertical else 'horizontal',
+                             coord / 1000000, range_start / 1000000, range_end / 1000000)
 
         # Generate routing options:
         # 1. Direct pin-to-pin (original algorithm)
@@ -269,199 +652,117 @@ class SmartRoutingEngine:
         if bus_structures:
             bus_aware_path = self._generate_bus_routing_path(start_pos, end_pos, bus_structures)
 
-            if bus_aware_path:
-                print(f"DEBUG: Generated bus-aware path with length {bus_aware_path.total_length/1000000:.2f}mm")
-            else:
-                print(f"DEBUG: No beneficial bus-aware path found")
+            if debug:
+                if bus_aware_path:
+                    logger.debug("Generated bus-aware path with length %.2fmm", bus_aware_path.total_length / 1000000)
+                else:
+                    logger.debug("No beneficial bus-aware path found")
 
             # Compare paths and select the best one
             if bus_aware_path and self._is_better_path(bus_aware_path, direct_path):
                 # Set pin references for bus-aware path
                 bus_aware_path.start_pin = start_pin
                 bus_aware_path.end_pin = end_pin
-                print(f"DEBUG: Selected BUS-AWARE path")
+                logger.debug("Selected BUS-AWARE path")
                 return bus_aware_path
             else:
-                print(f"DEBUG: Selected DIRECT path (bus path not better)")
+                logger.debug("Selected DIRECT path (bus path not better)")
 
         return direct_path
 
-    def _generate_direct_manhattan_path(self, start_pin: Pin, end_pin: Pin,
-                                       avoid_components: List[Symbol] = None) -> RoutingPath:
-        """Original Manhattan path generation (moved from generate_manhattan_path)"""
-        avoid_components = avoid_components or []
-
-        # Get connection points (may be offset from pin centers for proper approach)
-        start_pos = start_pin.get_connection_point()
-        end_pos = end_pin.get_connection_point()
-
-        # Determine routing preferences based on pin orientations
-        prefer_horizontal, prefer_vertical = self._get_routing_preferences(start_pin, end_pin)
-
-        # Compute optimal break point using KiCad's actual algorithm
-        break_point = self.compute_break_point(
-            start_pos, end_pos,
-            RoutingMode.MANHATTAN,
-            prefer_horizontal,
-            prefer_vertical
-        )
-
-        # Create two-segment Manhattan path
-        segments = [
-            (start_pos, break_point),
-            (break_point, end_pos)
-        ]
-
-        # Calculate total path length
-        total_length = start_pos.distance_to(break_point) + break_point.distance_to(end_pos)
-
-        path = RoutingPath(
-            start_pin=start_pin,
-            end_pin=end_pin,
-            segments=segments,
-            total_length=total_length,
-            mode=RoutingMode.MANHATTAN
-        )
-
-        # Score the path quality (lower length = higher score)
-        path.quality_score = 1000000.0 / (total_length + 1.0)
-
-        return path
-
-    def _analyze_bus_structures(self, existing_wires: List[dict]) -> List[dict]:
+    def _analyze_bus_structures(self, existing_wires: 'List[dict] | BusCandidateSet') -> BusCandidateSet:
         """
         Analyze existing wires to identify potential bus structures.
 
-        Returns list of bus structures with connection information.
+        A BusCandidateSet that was already built is returned as is.
         """
-        buses = []
-        min_bus_length = 5000000  # 5mm minimum for bus consideration
-
-        for wire in existing_wires:
-            # Only consider electrical wires (not graphical lines)
-            if wire.get('layer_type') != 'WIRE':
-                continue
-
-            length = wire.get('length_nm', 0)
-            if length < min_bus_length:
-                continue
-
-            # Check if wire is axis-aligned (horizontal or vertical)
-            if wire.get('is_horizontal'):
-                buses.append({
-                    'type': 'horizontal',
-                    'id': wire['id'],
-                    'coordinate': wire['start']['y_nm'],  # Y-coordinate of horizontal bus
-                    'range_start': min(wire['start']['x_nm'], wire['end']['x_nm']),
-                    'range_end': max(wire['start']['x_nm'], wire['end']['x_nm']),
-                    'length_nm': length,
-                    'start_pos': wire['start'],
-                    'end_pos': wire['end']
-                })
-            elif wire.get('is_vertical'):
-                buses.append({
-                    'type': 'vertical',
-                    'id': wire['id'],
-                    'coordinate': wire['start']['x_nm'],  # X-coordinate of vertical bus
-                    'range_start': min(wire['start']['y_nm'], wire['end']['y_nm']),
-                    'range_end': max(wire['start']['y_nm'], wire['end']['y_nm']),
-                    'length_nm': length,
-                    'start_pos': wire['start'],
-                    'end_pos': wire['end']
-                })
-
-        # Sort buses by length (longer buses are more attractive for routing)
-        buses.sort(key=lambda x: x['length_nm'], reverse=True)
-        return buses
+        if isinstance(existing_wires, BusCandidateSet):
+            return existing_wires
+        return BusCandidateSet.from_wires(existing_wires)
 
     def _generate_bus_routing_path(self, start_pos: Position, end_pos: Position,
-                                 bus_structures: List[dict]) -> RoutingPath:
+                                 bus_structures: BusCandidateSet) -> RoutingPath:
         """
         Generate routing path that uses existing bus structures when beneficial.
 
         This implements multi-hop routing: pin → bus → destination
         """
-        best_path = None
+        if len(bus_structures) >= _VECTOR_BUS_SCORING_MIN:
+            return self._generate_bus_routing_path_vectorized(start_pos, end_pos, bus_structures)
+        
+        best_bus = None
+        best_point = None
         best_length = float('inf')
 
-        for bus in bus_structures:
+        for i, (coord, range_start, range_end, _, vertical) in enumerate(bus_structures.records.tolist()):
             # Check if this bus can provide a beneficial routing path
-            connection_point = self._find_optimal_bus_connection_point(start_pos, end_pos, bus)
-
-            if connection_point:
-                # Calculate multi-hop path: start → bus → end
-                leg1_length = start_pos.distance_to(connection_point)
-                leg2_length = connection_point.distance_to(end_pos)
-                total_length = leg1_length + leg2_length
-
-                if total_length < best_length:
-                    # Create Manhattan path segments (90-degree angles only)
-                    # For bus routing, we need to create proper L-shaped paths
-                    segments = []
-
-                    # First leg: route from start to bus connection point
-                    # This should be a Manhattan path, not diagonal
-                    if start_pos.x_nm != connection_point.x_nm and start_pos.y_nm != connection_point.y_nm:
-                        # Need L-shaped path to reach bus
-                        # Prefer horizontal-first routing for cleaner schematics
-                        intermediate = Position(connection_point.x_nm, start_pos.y_nm)
-                        segments.append((start_pos, intermediate))  # Horizontal segment
-                        segments.append((intermediate, connection_point))  # Vertical segment to bus
-                    else:
-                        # Already aligned - single segment
-                        segments.append((start_pos, connection_point))
-
-                    # Second leg: from bus connection to destination
-                    # The bus itself provides the connection, we just need the final segment
-                    if connection_point.x_nm != end_pos.x_nm or connection_point.y_nm != end_pos.y_nm:
-                        # Only add segment if not already at destination
-                        segments.append((connection_point, end_pos))
-
-                    best_path = RoutingPath(
-                        start_pin=None,  # Will be set by caller
-                        end_pin=None,    # Will be set by caller
-                        segments=segments,
-                        total_length=total_length,
-                        mode=RoutingMode.MANHATTAN
-                    )
-                    best_path.quality_score = 1000000.0 / (total_length + 1.0)
-                    best_path.bus_used = bus['id']  # Track which bus was used
-                    best_length = total_length
-
-        return best_path
-
-    def _find_optimal_bus_connection_point(self, start_pos: Position, end_pos: Position,
-                                         bus: dict) -> Position:
+            connection_point = self._find_optimal_bus_connection_point(
+                start_pos, end_pos, vertical, coord, range_start, range_end)
+
+            # Calculate multi-hop path: start → bus → end
+            leg1_length = start_pos.distance_to(connection_point)
+            leg2_length = connection_point.distance_to(end_pos)
+            total_length = leg1_length + leg2_length
+
+            if total_length < best_length:
+                best_bus = i
+                best_point = connection_point
+                best_length = total_length
+
+        if best_bus is None:
+            return None
+        return _bus_path(start_pos, best_point, end_pos, best_length, bus_structures.ids[best_bus])
+
+    def _generate_bus_routing_path_vectorized(self, start_pos: Position, end_pos: Position,
+                                              bus_structures: BusCandidateSet) -> Optional[RoutingPath]:
+        """
+        _generate_bus_routing_path scoring every bus in one NumPy pass; picks the
+        same bus (the first of equally short ones) as the per-bus loop.
+        """
+        records = bus_structures.records
+        cx, cy, lengths = _bus_connection_points(start_pos.x_nm, start_pos.y_nm, end_pos.x_nm, end_pos.y_nm,
+                                                 records['vertical'], records['coord'],
+                                                 records['range_start'], records['range_end'])
+        best = int(np.argmin(lengths))
+        
+        connection_point = Position(int(cx[best]), int(cy[best]))
+        # Same float the per-bus loop stores, independent of NumPy's hypot rounding
+        total_length = start_pos.distance_to(connection_point) + connection_point.distance_to(end_pos)
+        return _bus_path(start_pos, connection_point, end_pos, total_length, bus_structures.ids[best])
+
+    def _find_optimal_bus_connection_point(self, start_pos: Position, end_pos: Position, vertical: bool,
+                                         coordinate: int, range_start: int, range_end: int) -> Position:
         """
         Find optimal point on bus structure to connect routing path.
 
+        The bus is one BusCandidateSet record: its axis, fixed coordinate and range.
         Returns the point on the bus that minimizes total routing length.
         """
-        if bus['type'] == 'horizontal':
+        if not vertical:
             # Bus is horizontal - connection point has same Y, varying X
-            bus_y = bus['coordinate']
+            bus_y = coordinate
 
             # Check if either pin is already aligned with bus Y-coordinate
-            start_aligned = abs(start_pos.y_nm - bus_y) < 100000  # 0.1mm tolerance
-            end_aligned = abs(end_pos.y_nm - bus_y) < 100000
+            start_aligned = abs(start_pos.y_nm - bus_y) < _BUS_ALIGN_TOLERANCE_NM
+            end_aligned = abs(end_pos.y_nm - bus_y) < _BUS_ALIGN_TOLERANCE_NM
 
             if start_aligned:
                 # Start pin is aligned with bus - connect at start X
-                connection_x = max(bus['range_start'], min(bus['range_end'], start_pos.x_nm))
+                connection_x = max(range_start, min(range_end, start_pos.x_nm))
                 return Position(connection_x, bus_y)
             elif end_aligned:
                 # End pin is aligned with bus - connect at end X
-                connection_x = max(bus['range_start'], min(bus['range_end'], end_pos.x_nm))
+                connection_x = max(range_start, min(range_end, end_pos.x_nm))
                 return Position(connection_x, bus_y)
             else:
                 # Neither pin aligned - find optimal connection point
                 optimal_x = (start_pos.x_nm + end_pos.x_nm) // 2
-                connection_x = max(bus['range_start'], min(bus['range_end'], optimal_x))
+                connection_x = max(range_start, min(range_end, optimal_x))
                 return Position(connection_x, bus_y)
 
-        elif bus['type'] == 'vertical':
+        else:
             # Bus is vertical - connection point has same X, varying Y
-            bus_x = bus['coordinate']
+            bus_x = coordinate
 
             # For vertical buses, prioritize connecting at the coordinate that minimizes total routing length
             # This creates direct horizontal connections when possible (like battery → bus scenarios)
@@ -471,8 +772,8 @@ class SmartRoutingEngine:
             end_y_option = end_pos.y_nm      # Connect at end pin's Y level
 
             # Ensure connection points are within the bus range
-            start_y_clamped = max(bus['range_start'], min(bus['range_end'], start_y_option))
-            end_y_clamped = max(bus['range_start'], min(bus['range_end'], end_y_option))
+            start_y_clamped = max(range_start, min(range_end, start_y_option))
+            end_y_clamped = max(range_start, min(range_end, end_y_option))
 
             # Calculate total routing path lengths for both connection options
             # Full path is: start_pos → connection_point → end_pos
@@ -487,22 +788,27 @@ class SmartRoutingEngine:
 
             # Choose the connection point that creates the shortest total routing path
             # This ensures we get the most efficient overall route
-            print(f"DEBUG BUS CONNECTION CALCULATION:")
-            print(f"  Bus at x={bus_x/1000000:.2f}mm, range y={bus['range_start']/1000000:.2f}-{bus['range_end']/1000000:.2f}mm")
-            print(f"  Start Y={start_y_option/1000000:.2f}mm, clamped to {start_y_clamped/1000000:.2f}mm")
-            print(f"  End Y={end_y_option/1000000:.2f}mm, clamped to {end_y_clamped/1000000:.2f}mm")
-            print(f"  Option 1 (start Y): total length={start_total_length/1000000:.2f}mm")
-            print(f"  Option 2 (end Y): total length={end_total_length/1000000:.2f}mm")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("BUS CONNECTION CALCULATION:")
+                logger.debug("  Bus at x=%.2fmm, range y=%.2f-%.2fmm", bus_x / 1000000,
+                             range_start / 1000000, range_end / 1000000)
+                logger.debug("  Start Y=%.2fmm, clamped to %.2fmm", start_y_option / 1000000, start_y_clamped / 1000000)
+                logger.debug("  End Y=%.2fmm, clamped to %.2fmm", end_y_option / 1000000, end_y_clamped / 1000000)
+                logger.debug("  Option 1 (start Y): total length=%.2fmm", start_total_length / 1000000)
+                logger.debug("  Option 2 (end Y): total length=%.2fmm", end_total_length / 1000000)
 
             if start_total_length <= end_total_length:
-                print(f"  → Choosing start Y connection at ({bus_x/1000000:.2f}, {start_y_clamped/1000000:.2f})")
+                if debug:
+                    logger.debug("  → Choosing start Y connection at (%.2f, %.2f)",
+                                 bus_x / 1000000, start_y_clamped / 1000000)
                 return start_connection
             else:
-                print(f"  → Choosing end Y connection at ({bus_x/1000000:.2f}, {end_y_clamped/1000000:.2f})")
+                if debug:
+                    logger.debug("  → Choosing end Y connection at (%.2f, %.2f)",
+                                 bus_x / 1000000, end_y_clamped / 1000000)
                 return end_connection
 
-        return None
-
     def _is_better_path(self, bus_path: RoutingPath, direct_path: RoutingPath) -> bool:
         """
         Determine if bus-aware path is better than direct path.
@@ -512,23 +818,24 @@ class SmartRoutingEngine:
         # Bus path should be meaningfully shorter to be worth the complexity
         length_improvement = (direct_path.total_length - bus_path.total_length) / direct_path.total_length
 
-        # DEBUG: Path comparison analysis
-        print(f"DEBUG PATH COMPARISON:")
-        print(f"  Direct path length: {direct_path.total_length/1000000:.2f}mm")
-        print(f"  Bus path length: {bus_path.total_length/1000000:.2f}mm")
-        print(f"  Length improvement: {length_improvement*100:.1f}%")
+        # Path comparison analysis
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PATH COMPARISON:")
+            logger.debug("  Direct path length: %.2fmm", direct_path.total_length / 1000000)
+            logger.debug("  Bus path length: %.2fmm", bus_path.total_length / 1000000)
+            logger.debug("  Length improvement: %.1f%%", length_improvement * 100)
 
         # Require at least 10% improvement to justify bus routing
         if length_improvement > 0.1:
-            print(f"  → CHOOSING BUS PATH (>10% improvement)")
+            logger.debug("  → CHOOSING BUS PATH (>%d%% improvement)", 10)
             return True
 
         # Even small improvements are valuable for professional appearance
         if length_improvement > 0.05 and bus_path.total_length < direct_path.total_length:
-            print(f"  → CHOOSING BUS PATH (>5% improvement)")
+            logger.debug("  → CHOOSING BUS PATH (>%d%% improvement)", 5)
             return True
 
-        print(f"  → CHOOSING DIRECT PATH (insufficient improvement)")
+        logger.debug("  → CHOOSING DIRECT PATH (insufficient improvement)")
         return False
 
     def generate_manhattan_path(self, start_pin: Pin, end_pin: Pin,
@@ -548,38 +855,227 @@ class SmartRoutingEngine:
         start_pos = start_pin.get_connection_point()
         end_pos = end_pin.get_connection_point()
         
+        # Pins already in line need one straight segment: no preferences, no break point
+        if start_pos.x_nm == end_pos.x_nm or start_pos.y_nm == end_pos.y_nm:
+            return _straight_path(start_pin, end_pin, start_pos, end_pos)
+        
         # Determine routing preferences based on pin orientations
         prefer_horizontal, prefer_vertical = self._get_routing_preferences(start_pin, end_pin)
-        
-        # Compute optimal break point using KiCad's actual algorithm
-        break_point = self.compute_break_point(
-            start_pos, end_pos, 
-            RoutingMode.MANHATTAN, 
-            prefer_horizontal,
-            prefer_vertical
+
+        # Break point, length and score of the two-segment path (KiCad's algorithm, memoized)
+        leg = _cached_manhattan_leg(start_pos.x_nm, start_pos.y_nm, end_pos.x_nm, end_pos.y_nm,
+                                    prefer_horizontal, prefer_vertical)
+        break_point = leg.break_point
+
+        return RoutingPath(
+            start_pin=start_pin,
+            end_pin=end_pin,
+            segments=[
+                (start_pos, break_point),
+                (break_point, end_pos)
+            ],
+            total_length=leg.total_length,
+            mode=RoutingMode.MANHATTAN,
+            quality_score=leg.quality_score
         )
+    
+    # Bus-aware routing's direct candidate is the plain Manhattan path
+    _generate_direct_manhattan_path = generate_manhattan_path
+    
+    def generate_manhattan_paths_batch(self, start_xy: np.ndarray, end_xy: np.ndarray,
+                                       prefer_horizontal: Optional[np.ndarray] = None,
+                                       prefer_vertical: Optional[np.ndarray] = None
+                                       ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Manhattan break points for many nets at once.
         
-        # Create two-segment Manhattan path
-        segments = [
-            (start_pos, break_point),
-            (break_point, end_pos)
-        ]
+        Vectorized form of compute_break_point(..., RoutingMode.MANHATTAN, ...):
+        each net breaks vertically first when prefer_vertical is set, or when
+        prefer_horizontal is not set and |dx| < |dy|.
         
-        # Calculate total path length
-        total_length = start_pos.distance_to(break_point) + break_point.distance_to(end_pos)
+        Args:
+            start_xy: (N, 2) start positions in nm
+            end_xy: (N, 2) end positions in nm
+            prefer_horizontal: Optional (N,) bool array
+            prefer_vertical: Optional (N,) bool array
+            
+        Returns:
+            ((N, 2) int64 break points, (N,) int64 total path lengths)
+        """
+        start_xy = np.asarray(start_xy, dtype=np.int64).reshape(-1, 2)
+        end_xy = np.asarray(end_xy, dtype=np.int64).reshape(-1, 2)
+        abs_dx = np.abs(end_xy[:, 0] - start_xy[:, 0])
+        abs_dy = np.abs(end_xy[:, 1] - start_xy[:, 1])
         
-        path = RoutingPath(
-            start_pin=start_pin,
-            end_pin=end_pin,
-            segments=segments,
-            total_length=total_length,
-            mode=RoutingMode.MANHATTAN
-        )
+        vertical = abs_dx < abs_dy
+        if prefer_horizontal is not None:
+            vertical &= ~np.asarray(prefer_horizontal, dtype=bool)
+        if prefer_vertical is not None:
+            vertical |= np.asarray(prefer_vertical, dtype=bool)
         
-        # Score the path quality (lower length = higher score)
-        path.quality_score = 1000000.0 / (total_length + 1.0)
+        # Vertical first breaks at (start.x, end.y), horizontal first at (end.x, start.y)
+        break_xy = np.empty_like(start_xy)
+        break_xy[:, 0] = np.where(vertical, start_xy[:, 0], end_xy[:, 0])
+        break_xy[:, 1] = np.where(vertical, end_xy[:, 1], start_xy[:, 1])
         
-        return path
+        # Both legs are axis-aligned, so the path length is the L1 distance
+        return break_xy, abs_dx + abs_dy
+    
+    def route_all(self, start_xy: np.ndarray, end_xy: np.ndarray,
+                  start_orientation: np.ndarray, end_orientation: np.ndarray
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Manhattan-route N independent pin pairs: what generate_manhattan_path
+        computes per pair, as arrays. Runs in parallel when numba is installed,
+        otherwise through routing_preferences_batch and generate_manhattan_paths_batch.
+        
+        Args:
+            start_xy: (N, 2) start pin positions in nm
+            end_xy: (N, 2) end pin positions in nm
+            start_orientation: (N,) start pin orientations
+            end_orientation: (N,) end pin orientations
+            
+        Returns:
+            ((N, 2) int64 break points, (N,) int64 total path lengths)
+        """
+        start_xy = np.ascontiguousarray(start_xy, dtype=np.int64).reshape(-1, 2)
+        end_xy = np.ascontiguousarray(end_xy, dtype=np.int64).reshape(-1, 2)
+        start_orientation = np.ascontiguousarray(start_orientation, dtype=np.int64)
+        end_orientation = np.ascontiguousarray(end_orientation, dtype=np.int64)
+        
+        kernel = _load_numba_route_kernel()
+        if kernel is None:
+            prefer_horizontal, prefer_vertical = self.routing_preferences_batch(
+                start_xy, end_xy, start_orientation, end_orientation)
+            return self.generate_manhattan_paths_batch(start_xy, end_xy, prefer_horizontal, prefer_vertical)
+        
+        break_xy = np.empty_like(start_xy)
+        lengths = np.empty(len(start_xy), dtype=np.int64)
+        kernel(start_xy, end_xy, start_orientation, end_orientation, self.grid_size_nm, break_xy, lengths)
+        return break_xy, lengths
+    
+    def batch_route(self, pairs: List[Tuple[Pin, Pin]],
+                    existing_wires: 'List[dict] | BusCandidateSet' = None,
+                    avoid_components: List[Symbol] = None) -> List[RoutingPath]:
+        """
+        generate_bus_aware_manhattan_path for many pin pairs over the same wires.
+        
+        The wires are analyzed once, direct break points come from route_all and
+        every pair is scored against every bus in array passes; RoutingPath
+        objects are only built for the results.
+        
+        Args:
+            pairs: (start_pin, end_pin) pairs to route
+            existing_wires: Existing wire structures from schematic, or a BusCandidateSet
+            avoid_components: Components to route around
+            
+        Returns:
+            One RoutingPath per pair, in order
+        """
+        if not pairs:
+            return []
+        buses = self._analyze_bus_structures(existing_wires or [])
+        
+        n = len(pairs)
+        start_positions = [start_pin.get_connection_point() for start_pin, _ in pairs]
+        end_positions = [end_pin.get_connection_point() for _, end_pin in pairs]
+        start_xy = np.array([(pos.x_nm, pos.y_nm) for pos in start_positions], dtype=np.int64)
+        end_xy = np.array([(pos.x_nm, pos.y_nm) for pos in end_positions], dtype=np.int64)
+        start_orientation = np.fromiter((start_pin.orientation for start_pin, _ in pairs), dtype=np.int64, count=n)
+        end_orientation = np.fromiter((end_pin.orientation for _, end_pin in pairs), dtype=np.int64, count=n)
+        
+        break_xy, lengths = self.route_all(start_xy, end_xy, start_orientation, end_orientation)
+        
+        # Best bus per pair (its index and connection point): in parallel with
+        # numba, otherwise scored in row chunks
+        if buses:
+            records = buses.records
+            best_bus = np.empty(n, dtype=np.intp)
+            connection_xy = np.empty((n, 2), dtype=np.int64)
+            kernel = _load_numba_bus_kernel()
+            if kernel is not None:
+                kernel(start_xy, end_xy, records['vertical'], records['coord'], records['range_start'],
+                       records['range_end'], _BUS_ALIGN_TOLERANCE_NM, best_bus, connection_xy)
+            else:
+                rows = max(1, _BATCH_BUS_CELLS // len(buses))
+                for lo in range(0, n, rows):
+                    hi = min(n, lo + rows)
+                    cx, cy, bus_lengths = _bus_connection_points(
+                        start_xy[lo:hi, 0:1], start_xy[lo:hi, 1:2], end_xy[lo:hi, 0:1], end_xy[lo:hi, 1:2],
+                        records['vertical'], records['coord'], records['range_start'], records['range_end'])
+                    best = np.argmin(bus_lengths, axis=1)
+                    picked = np.arange(hi - lo)
+                    best_bus[lo:hi] = best
+                    connection_xy[lo:hi, 0] = cx[picked, best]
+                    connection_xy[lo:hi, 1] = cy[picked, best]
+            best_bus = best_bus.tolist()
+            connection_xy = connection_xy.tolist()
+        
+        paths = []
+        for i, ((start_pin, end_pin), start_pos, end_pos, (bx, by), length) in enumerate(
+                zip(pairs, start_positions, end_positions, break_xy.tolist(), lengths.tolist())):
+            if start_pos.x_nm == end_pos.x_nm or start_pos.y_nm == end_pos.y_nm:
+                path = _straight_path(start_pin, end_pin, start_pos, end_pos)
+            else:
+                break_point = Position(bx, by)
+                path = RoutingPath(
+                    start_pin=start_pin,
+                    end_pin=end_pin,
+                    segments=[(start_pos, break_point), (break_point, end_pos)],
+                    total_length=length,
+                    mode=RoutingMode.MANHATTAN,
+                    # Lower length = higher score
+                    quality_score=1000000.0 / (length + 1.0)
+                )
+            
+            if buses:
+                connection_point = Position(*connection_xy[i])
+                total_length = start_pos.distance_to(connection_point) + connection_point.distance_to(end_pos)
+                bus_path = _bus_path(start_pos, connection_point, end_pos, total_length,
+                                     buses.ids[best_bus[i]])
+                if self._is_better_path(bus_path, path):
+                    bus_path.start_pin = start_pin
+                    bus_path.end_pin = end_pin
+                    path = bus_path
+            paths.append(path)
+        
+        return paths
+    
+    def routing_preferences_batch(self, start_xy: np.ndarray, end_xy: np.ndarray,
+                                  start_orientation: np.ndarray, end_orientation: np.ndarray
+                                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        _get_routing_preferences for many pin pairs at once, shaped to feed
+        generate_manhattan_paths_batch.
+        
+        Args:
+            start_xy: (N, 2) start pin positions in nm
+            end_xy: (N, 2) end pin positions in nm
+            start_orientation: (N,) start pin orientations (0=East, 1=North, 2=West, 3=South)
+            end_orientation: (N,) end pin orientations
+            
+        Returns:
+            ((N,) prefer_horizontal, (N,) prefer_vertical) bool arrays
+        """
+        start_xy = np.asarray(start_xy, dtype=np.int64).reshape(-1, 2)
+        end_xy = np.asarray(end_xy, dtype=np.int64).reshape(-1, 2)
+        start_orientation = np.asarray(start_orientation, dtype=np.int64)
+        end_orientation = np.asarray(end_orientation, dtype=np.int64)
+        
+        # Orientation table first, unknown orientations get no preference...
+        known = ((start_orientation >= 0) & (start_orientation < 4)
+                 & (end_orientation >= 0) & (end_orientation < 4))
+        by_orientation = _ORIENTATION_PREFERENCE_ARRAY[start_orientation % 4, end_orientation % 4]
+        prefer_horizontal = by_orientation[:, 0] & known
+        prefer_vertical = by_orientation[:, 1] & known
+        
+        # ...then alignment overrides it, horizontal alignment taking precedence
+        aligned_x = np.abs(start_xy[:, 0] - end_xy[:, 0]) < self.grid_size_nm
+        aligned_y = np.abs(start_xy[:, 1] - end_xy[:, 1]) < self.grid_size_nm
+        prefer_horizontal = np.where(aligned_y, True, np.where(aligned_x, False, prefer_horizontal))
+        prefer_vertical = np.where(aligned_y, False, np.where(aligned_x, True, prefer_vertical))
+        
+        return prefer_horizontal, prefer_vertical
     
     def _get_routing_preferences(self, start_pin: Pin, end_pin: Pin) -> tuple[bool, bool]:
         """
@@ -603,75 +1099,252 @@ class SmartRoutingEngine:
             # Vertically aligned - prefer vertical routing  
             return (False, True)
         
-        # Check pin orientations for smart approach angles
-        # Pin orientation: 0=East, 1=North, 2=West, 3=South
-        start_is_horizontal = start_pin.orientation in [0, 2]  # East or West
-        end_is_horizontal = end_pin.orientation in [0, 2]      # East or West
-        
-        # If both pins are horizontally oriented, prefer vertical first to connect properly
-        if start_is_horizontal and end_is_horizontal:
-            return (False, True)
-            
-        # If both pins are vertically oriented, prefer horizontal first to connect properly
-        start_is_vertical = start_pin.orientation in [1, 3]    # North or South
-        end_is_vertical = end_pin.orientation in [1, 3]        # North or South
-        
-        if start_is_vertical and end_is_vertical:
-            return (True, False)
+        # Otherwise the pin orientations alone decide (see _ORIENTATION_PREFERENCES)
+        start_orientation = start_pin.orientation
+        end_orientation = end_pin.orientation
+        if 0 <= start_orientation < 4 and 0 <= end_orientation < 4:
+            return _ORIENTATION_PREFERENCES[start_orientation][end_orientation]
         
-        # Mixed orientations - use KiCad's distance-based logic as default
-        # This will be handled by the algorithm itself (no strong preference)
+        # Unknown orientation - no strong preference, the break point falls back to distance
         return (False, False)
     
-    def find_routing_anchors(self, position: Position, symbols: List[Symbol]) -> List[RoutingAnchor]:
+    def find_routing_anchors(self, position: Position, symbols: List[Symbol],
+                             limit: Optional[int] = None) -> List[RoutingAnchor]:
         """
         Find optimal snap points near a position for smart routing.
         
         Port of EE_GRID_HELPER::BestSnapAnchor() functionality.
+        
+        With limit, only the first limit anchors of the full ranking are
+        selected and built; the rest are never sorted or allocated.
         """
+        # Pin anchors within snap range, filtering on squared distance
+        pins, pin_xy = self._pin_arrays(symbols)
+        candidates = self._pins_near(position)
+        dx = pin_xy[candidates, 0] - position.x_nm
+        dy = pin_xy[candidates, 1] - position.y_nm
+        d2 = dx * dx + dy * dy
+        in_range = d2 <= self._snap_range_sq
+        hits = candidates[in_range]
+        hit_d2 = d2[in_range]
+        grid_anchor = self._grid_anchor(position)
+        
+        # Pin bucket, nearest first; ties keep index order
+        if limit is not None and limit < len(hit_d2):
+            if limit <= 0:
+                return []
+            # Everything up to the limit-th smallest distance (ties included), then a
+            # stable sort of just those, so the result is a prefix of the full ranking
+            kth_d2 = np.partition(hit_d2, limit - 1)[limit - 1]
+            selected = np.flatnonzero(hit_d2 <= kth_d2)
+            order = selected[np.argsort(hit_d2[selected], kind='stable')][:limit]
+        else:
+            order = np.argsort(hit_d2, kind='stable')
+        
         anchors = []
+        for slot in order.tolist():
+            pin = pins[int(hits[slot])]
+            distance_sq = int(hit_d2[slot])
+            anchors.append(RoutingAnchor(
+                position=pin.position,
+                anchor_type=AnchorType.PIN,
+                item_id=pin.id,
+                distance=math.sqrt(distance_sq),
+                priority=_PIN_ANCHOR_PRIORITY,
+                distance_sq=distance_sq
+            ))
         
-        # Add grid anchor
-        grid_x = round(position.x_nm / self.grid_size_nm) * self.grid_size_nm
-        grid_y = round(position.y_nm / self.grid_size_nm) * self.grid_size_nm
-        grid_pos = Position(grid_x, grid_y)
+        # Grid bucket: the single snapped grid point
+        if limit is None or len(anchors) < limit:
+            anchors.append(grid_anchor)
         
-        anchors.append(RoutingAnchor(
+        return anchors
+    
+    def best_snap_anchor(self, position: Position, symbols: List[Symbol]) -> RoutingAnchor:
+        """
+        The anchor find_routing_anchors would rank first, without building or
+        sorting the rest: the nearest pin within snap range, else the grid point.
+        """
+        pins, pin_xy = self._pin_arrays(symbols)
+        candidates = self._pins_near(position)
+        if len(candidates):
+            dx = pin_xy[candidates, 0] - position.x_nm
+            dy = pin_xy[candidates, 1] - position.y_nm
+            d2 = dx * dx + dy * dy
+            # argmin keeps the first of equal distances, matching the stable sort
+            nearest = int(np.argmin(d2))
+            nearest_d2 = int(d2[nearest])
+            if nearest_d2 <= self._snap_range_sq:
+                pin = pins[candidates[nearest]]
+                return RoutingAnchor(
+                    position=pin.position,
+                    anchor_type=AnchorType.PIN,
+                    item_id=pin.id,
+                    distance=math.sqrt(nearest_d2),
+                    priority=_PIN_ANCHOR_PRIORITY,
+                    distance_sq=nearest_d2
+                )
+        return self._grid_anchor(position)
+    
+    def _grid_anchor(self, position: Position) -> RoutingAnchor:
+        """Grid anchor nearest to position (integer snap, ties rounding up)"""
+        grid = self.grid_size_nm
+        half_grid = grid // 2
+        grid_x = (position.x_nm + half_grid) // grid * grid
+        grid_y = (position.y_nm + half_grid) // grid * grid
+        grid_pos = _grid_position(grid_x, grid_y)
+        distance_sq = position.distance_sq_to(grid_pos)
+        
+        return RoutingAnchor(
             position=grid_pos,
             anchor_type=AnchorType.GRID,
-            distance=position.distance_to(grid_pos),
-            priority=10
-        ))
-        
-        # Add pin anchors within snap range
-        for symbol in symbols:
-            for pin in symbol.pins:
-                distance = position.distance_to(pin.position)
-                if distance <= self.snap_range_nm:
-                    anchors.append(RoutingAnchor(
-                        position=pin.position,
-                        anchor_type=AnchorType.PIN,
-                        item_id=pin.id,
-                        distance=distance,
-                        priority=1  # Pins have highest priority
-                    ))
-        
-        # Sort by priority (lower = higher priority) then by distance  
-        anchors.sort(key=lambda a: (a.priority, a.distance))
+            distance=math.sqrt(distance_sq),
+            priority=_GRID_ANCHOR_PRIORITY,
+            distance_sq=distance_sq
+        )
+    
+    def snap_to_grid_batch(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Nearest grid points to (N, 2) positions in nm, with the same integer
+        snap as the grid anchor (ties rounding up).
+        """
+        grid = self.grid_size_nm
+        xy = np.asarray(xy, dtype=np.int64)
+        return (xy + grid // 2) // grid * grid
+    
+    def build_pin_index(self, symbols: List[Symbol]) -> None:
+        """
+        (Re)build the pin index find_routing_anchors queries. It is built on
+        demand whenever a different symbols list is passed; call this after
+        moving symbols or pins within the same list.
+        """
+        self._pin_cache_symbols = None
+        self._pin_arrays(symbols)
+    
+    def _pin_arrays(self, symbols: List[Symbol]) -> Tuple[List[Pin], np.ndarray]:
+        """
+        Returns every pin of symbols and their positions as an (N, 2) int64 array.
+        Rebuilt only when a different symbols list (or one of a different length) is passed.
+        """
+        if symbols is not self._pin_cache_symbols or len(symbols) != self._pin_cache_len:
+            pins = [pin for symbol in symbols for pin in symbol.pins]
+            # Filled straight from the pins as x0, y0, x1, y1, ... - no per-pin tuples
+            self._pin_xy = np.fromiter(
+                (coord for pin in pins for coord in (pin.position.x_nm, pin.position.y_nm)),
+                dtype=np.int64,
+                count=2 * len(pins),
+            ).reshape(-1, 2)
+            self._pins = pins
+            self._pin_cache_symbols = symbols
+            self._pin_cache_len = len(symbols)
+            self._pin_cell_size = 0
+        return self._pins, self._pin_xy
+    
+    def _pins_near(self, position: Position) -> np.ndarray:
+        """
+        Sorted indices into _pin_xy of the pins in the 3x3 grid cells around
+        position. With cells one snap range wide this is a superset of the pins
+        within snap range. Call _pin_arrays first.
+        """
+        cell = max(self.snap_range_nm, 1)
+        if self._pin_cell_size != cell:
+            keys = self._pin_xy // cell
+            order = np.lexsort((keys[:, 1], keys[:, 0]))
+            sorted_keys = keys[order]
+            breaks = np.flatnonzero(np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)) + 1
+            self._pin_cells = {
+                (int(sorted_keys[group[0], 0]), int(sorted_keys[group[0], 1])): np.sort(order[group])
+                for group in np.split(np.arange(len(order)), breaks) if len(group)
+            }
+            self._pin_cell_size = cell
         
-        return anchors
+        cx = position.x_nm // cell
+        cy = position.y_nm // cell
+        cells = self._pin_cells
+        buckets = [
+            cells[key]
+            for key in ((cx + i, cy + j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+            if key in cells
+        ]
+        if not buckets:
+            return np.empty(0, dtype=np.intp)
+        if len(buckets) == 1:
+            return buckets[0]
+        return np.sort(np.concatenate(buckets))
     
     def route_wire_with_avoidance(self, start_pin: Pin, end_pin: Pin, 
                                  symbols: List[Symbol]) -> RoutingPath:
         """
         Generate routing path with component avoidance.
         
-        This will be expanded in Phase 3 to implement full collision detection
-        and multi-path optimization.
+        Routes the usual Manhattan L-shape; if it crosses the bounding box of a
+        symbol other than the two being connected, the opposite L-shape is used
+        instead when that one is clear. Full multi-path optimization is Phase 3.
+        
+        Symbol bounding boxes are indexed per symbols list; call
+        build_obstacle_index after moving a symbol or changing its bbox in place.
+        """
+        path = self.generate_manhattan_path(start_pin, end_pin, symbols)
+        
+        endpoints = {start_pin.symbol_reference, end_pin.symbol_reference}
+        # A straight path has no other corner to fall back to
+        if len(path.segments) != 2 or not self._segments_hit_obstacles(path.segments, symbols, endpoints):
+            return path
+        
+        # Same length, other corner
+        start_pos, break_point = path.segments[0]
+        end_pos = path.segments[1][1]
+        if break_point.x_nm == start_pos.x_nm:
+            other = Position(end_pos.x_nm, start_pos.y_nm)
+        else:
+            other = Position(start_pos.x_nm, end_pos.y_nm)
+        segments = [(start_pos, other), (other, end_pos)]
+        if self._segments_hit_obstacles(segments, symbols, endpoints):
+            return path
+        
+        path.segments = segments
+        return path
+    
+    def _segments_hit_obstacles(self, segments: List[Tuple[Position, Position]],
+                                symbols: List[Symbol], endpoints: set) -> bool:
+        """
+        Whether any segment touches the bounding box of a symbol whose reference
+        isn't in endpoints. Only boxes the index returns for a segment's extent are tested.
+        """
+        self._update_obstacle_index(symbols)
+        index, refs, boxes = self._obstacle_index, self._obstacle_refs, self._obstacle_boxes
+        if not len(index):
+            return False
+        for start, end in segments:
+            x0, y0, x1, y1 = start.x_nm, start.y_nm, end.x_nm, end.y_nm
+            rows = index.query(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+            candidates = [boxes[row] for row in rows.tolist() if refs[row] not in endpoints]
+            if candidates and _segments_hit_aabbs([(start, end)], candidates):
+                return True
+        return False
+    
+    def build_obstacle_index(self, symbols: List[Symbol]) -> None:
+        """
+        (Re)build the obstacle index route_wire_with_avoidance queries. It is built
+        on demand whenever a different symbols list is passed; call this after
+        moving symbols or changing their bbox within the same list.
+        """
+        self._obstacle_cache_symbols = None
+        self._update_obstacle_index(symbols)
+    
+    def _update_obstacle_index(self, symbols: List[Symbol]) -> None:
+        """
+        Rebuilds the obstacle index from the symbols that have a bbox, only when
+        a different symbols list (or one of a different length) is passed.
         """
-        # For now, use basic Manhattan routing
-        # Phase 3 will add sophisticated component avoidance
-        return self.generate_manhattan_path(start_pin, end_pin, symbols)
+        if symbols is self._obstacle_cache_symbols and len(symbols) == self._obstacle_cache_len:
+            return
+        boxed = [symbol for symbol in symbols if symbol.bbox is not None]
+        self._obstacle_refs = [symbol.reference for symbol in boxed]
+        self._obstacle_boxes = [symbol.bbox for symbol in boxed]
+        self._obstacle_index = STRIndex(np.array(self._obstacle_boxes, dtype=np.int64).reshape(-1, 4))
+        self._obstacle_cache_symbols = symbols
+        self._obstacle_cache_len = len(symbols)
 
 
 class SmartRoutingMCPIntegration:
@@ -687,34 +1360,52 @@ class SmartRoutingMCPIntegration:
     
     def convert_mcp_symbol_to_routing_symbol(self, mcp_symbol: Dict[str, Any]) -> Symbol:
         """Convert MCP symbol data to internal Symbol representation"""
-        pins = []
-        for pin_data in mcp_symbol.get('pins', []):
-            pin = Pin(
-                id=pin_data['id'],
-                name=pin_data['name'],
-                number=pin_data['number'],
-                position=Position(
-                    x_nm=pin_data['position']['x_nm'],
-                    y_nm=pin_data['position']['y_nm']
-                ),
-                orientation=pin_data['orientation'],
-                electrical_type=pin_data['electrical_type'],
-                length=pin_data['length'],
-                symbol_reference=mcp_symbol['reference']  # For debugging
-            )
-            pins.append(pin)
-        
-        return Symbol(
-            id=mcp_symbol['id'],
-            reference=mcp_symbol['reference'],
-            value=mcp_symbol['value'],
-            position=Position(
-                x_nm=mcp_symbol['position']['x_nm'],
-                y_nm=mcp_symbol['position']['y_nm']
-            ),
-            orientation_degrees=mcp_symbol['orientation_degrees'],
-            pins=pins
-        )
+        return self.convert_mcp_symbols_batch([mcp_symbol])[0]
+    
+    def convert_mcp_symbols_batch(self, mcp_symbols: List[Dict[str, Any]]) -> List[Symbol]:
+        """
+        Convert a list of MCP symbols in one pass.
+        
+        Pins are built positionally with the constructors bound to locals, so the
+        per-pin cost is the dict reads plus two object allocations.
+        """
+        make_pin = Pin
+        make_position = Position
+        symbols = []
+        for mcp_symbol in mcp_symbols:
+            reference = mcp_symbol['reference']
+            pins = [
+                make_pin(
+                    pin_data['id'],
+                    pin_data['name'],
+                    pin_data['number'],
+                    make_position(pin_data['position']['x_nm'], pin_data['position']['y_nm']),
+                    pin_data['orientation'],
+                    pin_data['electrical_type'],
+                    pin_data['length'],
+                    reference,  # For debugging
+                )
+                for pin_data in mcp_symbol.get('pins', ())
+            ]
+            position = mcp_symbol['position']
+            symbols.append(Symbol(
+                id=mcp_symbol['id'],
+                reference=reference,
+                value=mcp_symbol['value'],
+                position=make_position(position['x_nm'], position['y_nm']),
+                orientation_degrees=mcp_symbol['orientation_degrees'],
+                pins=pins
+            ))
+        return symbols
+    
+    def build_bus_candidates(self, existing_wires: List[Dict[str, Any]]) -> BusCandidateSet:
+        """
+        Filter and index the schematic's wires for bus-aware routing once.
+        
+        Pass the result as existing_wires to every
+        engine.generate_bus_aware_manhattan_path call over the same wires.
+        """
+        return BusCandidateSet.from_wires(existing_wires)
     
     def create_smart_wire_segments(self, path: RoutingPath) -> List[Dict[str, Any]]:
         """
@@ -724,23 +1415,40 @@ class SmartRoutingMCPIntegration:
         """
         wire_segments = []
         
-        for i, (start_pos, end_pos) in enumerate(path.segments):
+        for sx, sy, ex, ey, mode, i in self.create_smart_wire_segments_batch([path]).tolist():
             segment = {
                 "start_point": {
-                    "x_nm": start_pos.x_nm,
-                    "y_nm": start_pos.y_nm
+                    "x_nm": sx,
+                    "y_nm": sy
                 },
                 "end_point": {
-                    "x_nm": end_pos.x_nm,
-                    "y_nm": end_pos.y_nm
+                    "x_nm": ex,
+                    "y_nm": ey
                 },
                 "width": 0,  # Use default wire width
                 "segment_index": i,
-                "routing_mode": path.mode.value
+                "routing_mode": _ROUTING_MODES[mode].value
             }
             wire_segments.append(segment)
             
         return wire_segments
+    
+    def create_smart_wire_segments_batch(self, paths: List[RoutingPath]) -> np.ndarray:
+        """
+        Convert several routing paths to one WIRE_DTYPE array, segments in path order.
+        
+        Dicts are only worth building at the JSON boundary; arr.tolist() there
+        gives plain (sx, sy, ex, ey, mode, idx) tuples.
+        """
+        return np.array(
+            [
+                (start_pos.x_nm, start_pos.y_nm, end_pos.x_nm, end_pos.y_nm,
+                 _ROUTING_MODE_CODES[path.mode], i)
+                for path in paths
+                for i, (start_pos, end_pos) in enumerate(path.segments)
+            ],
+            dtype=WIRE_DTYPE,
+        )
 
 
 # Factory function for easy integration
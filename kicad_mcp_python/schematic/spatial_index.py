@@ -0,0 +1,126 @@
+"""
+Packed R-tree Spatial Index for Schematic Geometry
+
+This module provides a static, bulk-loaded R-tree over axis-aligned boxes,
+used to answer "which components overlap this rectangle" queries without
+scanning every component.
+
+Based on analysis of:
+- sch_rtree.h: KiCad's R-tree index of schematic items
+- Sort-Tile-Recursive (STR) bulk loading (Leutenegger et al.)
+
+The tree is rebuilt from scratch whenever the set of boxes changes, which
+matches how routing uses it: boundaries are collected once per schematic
+snapshot and then queried many times.
+"""
+
+from typing import List, Tuple
+import math
+
+import numpy as np
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate np.arange(s, e) for every (s, e) pair without a Python loop"""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total, dtype=np.int64)
+
+
+def _overlap_mask(boxes: np.ndarray, min_x: int, min_y: int, max_x: int, max_y: int) -> np.ndarray:
+    """Boxes are (N, 4) rows of (min_x, min_y, max_x, max_y); edges count as overlap"""
+    return ((boxes[:, 0] <= max_x) & (boxes[:, 2] >= min_x) &
+            (boxes[:, 1] <= max_y) & (boxes[:, 3] >= min_y))
+
+
+def _str_pack(boxes: np.ndarray, node_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sort-Tile-Recursive grouping of boxes into nodes of at most node_size.
+
+    Returns (order, starts, ends): boxes[order] lists the boxes node by node,
+    and node i owns boxes[order][starts[i]:ends[i]].
+    """
+    count = len(boxes)
+    node_count = math.ceil(count / node_size)
+    slice_count = math.ceil(math.sqrt(node_count))
+    slice_len = slice_count * node_size
+
+    center_x = boxes[:, 0] + boxes[:, 2]
+    center_y = boxes[:, 1] + boxes[:, 3]
+
+    order = np.argsort(center_x, kind="stable")
+    starts: List[int] = []
+    for slice_start in range(0, count, slice_len):
+        members = order[slice_start:slice_start + slice_len]
+        order[slice_start:slice_start + slice_len] = members[np.argsort(center_y[members], kind="stable")]
+        starts.extend(range(slice_start, min(slice_start + slice_len, count), node_size))
+
+    starts_arr = np.array(starts, dtype=np.int64)
+    ends_arr = np.minimum(starts_arr + node_size, np.append(starts_arr[1:], count))
+    # A node never spans two slices: its end is capped by the next node's start
+    return order, starts_arr, ends_arr
+
+
+class STRIndex:
+    """
+    Static packed R-tree over (N, 4) int64 boxes of (min_x, min_y, max_x, max_y).
+
+    query() returns the indices (into the original box array) of every box
+    that overlaps the query rectangle, in O(log N + k) node visits.
+    """
+
+    def __init__(self, boxes: np.ndarray, node_size: int = 16):
+        boxes = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+        self.node_size = node_size
+        self.size = len(boxes)
+
+        # Leaf entries, stored in packed order
+        self._entry_ids = np.arange(self.size, dtype=np.int64)
+        self._entry_boxes = boxes
+
+        # Levels from leaves upwards: (node bounds, child starts, child ends)
+        self._levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        if self.size == 0:
+            return
+
+        order, starts, ends = _str_pack(boxes, node_size)
+        self._entry_ids = order
+        self._entry_boxes = boxes[order]
+        children = self._entry_boxes
+
+        while True:
+            bounds = np.column_stack((
+                np.minimum.reduceat(children[:, 0], starts),
+                np.minimum.reduceat(children[:, 1], starts),
+                np.maximum.reduceat(children[:, 2], starts),
+                np.maximum.reduceat(children[:, 3], starts),
+            ))
+            self._levels.append((bounds, starts, ends))
+            if len(bounds) <= node_size:
+                break
+
+            # Pack this level's nodes into parents, keeping child ranges attached
+            order, starts, ends = _str_pack(bounds, node_size)
+            bounds_prev, starts_prev, ends_prev = self._levels[-1]
+            self._levels[-1] = (bounds_prev[order], starts_prev[order], ends_prev[order])
+            children = bounds_prev[order]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def query(self, min_x: int, min_y: int, max_x: int, max_y: int) -> np.ndarray:
+        """Indices of boxes overlapping the rectangle, in ascending order"""
+        if self.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Every top-level node is a candidate; walk down one level at a time
+        candidates = np.arange(len(self._levels[-1][0]), dtype=np.int64)
+        for bounds, starts, ends in reversed(self._levels):
+            candidates = candidates[_overlap_mask(bounds[candidates], min_x, min_y, max_x, max_y)]
+            candidates = _expand_ranges(starts[candidates], ends[candidates])
+
+        hits = candidates[_overlap_mask(self._entry_boxes[candidates], min_x, min_y, max_x, max_y)]
+        return np.sort(self._entry_ids[hits])
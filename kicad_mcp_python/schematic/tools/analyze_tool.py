@@ -1,11 +1,15 @@
 from dotenv import load_dotenv
 import time
 
+from kipy.proto.common.commands import editor_commands_pb2
+from kipy.proto.common.types import base_types_pb2
+from kipy.proto.schematic import schematic_commands_pb2
+from kipy.proto.schematic import schematic_types_pb2
+
 from ..schematicmodule import SchematicTool
 from ...core.mcp_manager import ToolManager
 
 from mcp.server.fastmcp import FastMCP
-from mcp.types import ImageContent
 
 load_dotenv()
 
@@ -102,9 +106,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
         Returns:
             dict: Complete schematic state organized by logical categories
         """
-        from kipy.proto.schematic import schematic_commands_pb2
-        from kipy.proto.schematic import schematic_types_pb2
-
         # Get active document
         doc_spec = self.get_active_schematic_document()
         if not doc_spec:
@@ -139,12 +140,10 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
 
     def _get_project_info_data(self, doc_spec):
         """Get project information data."""
-        from kipy.proto.schematic import schematic_commands_pb2
-
         try:
             request = schematic_commands_pb2.GetSchematicInfo()
             request.schematic.CopyFrom(doc_spec)
-            response = self.send_schematic_command("GetSchematicInfo", request)
+            response = self.send_get_schematic_info(request)
 
             return {
                 "name": response.project_name,
@@ -165,13 +164,10 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
 
     def _get_organized_items_data(self, doc_spec):
         """Get and organize all schematic items by logical categories."""
-        from kipy.proto.schematic import schematic_commands_pb2
-        from kipy.proto.schematic import schematic_types_pb2
-
         try:
             request = schematic_commands_pb2.GetSchematicItems()
             request.schematic.CopyFrom(doc_spec)
-            response = self.send_schematic_command("GetSchematicItems", request)
+            response = self.send_get_schematic_items(request)
 
             # Organize items by logical categories
             symbols = []
@@ -501,10 +497,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Dictionary containing pin positions and properties for the symbol
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-            
             # Get the active schematic document
             doc_spec = self.get_active_schematic_document()
             if not doc_spec:
@@ -516,7 +508,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             request.symbol_id.value = symbol_id
             
             # Send the actual IPC command to KiCad
-            response = self.send_schematic_command("GetSymbolPins", request)
+            response = self.send_get_symbol_pins(request)
             
             # Check for errors
             if response.error:
@@ -622,10 +614,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Result of the save operation
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.common.commands import editor_commands_pb2
-            from kipy.proto.common.types.base_types_pb2 import DocumentType
-            
             # Get the active schematic document
             doc_spec = self.get_active_schematic_document()
             if not doc_spec:
@@ -683,10 +671,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Result of the deletion operation
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.common.commands import editor_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-            
             if not item_ids or len(item_ids) == 0:
                 return {
                     "error": "No item IDs provided",
@@ -795,10 +779,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Dictionary containing selected items and their properties
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            
             # Get the active schematic document
             doc_spec = self.get_active_schematic_document()
             if not doc_spec:
@@ -815,7 +795,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             request.schematic.CopyFrom(doc_spec)
             
             # Send the actual IPC command to KiCad
-            response = self.send_schematic_command("GetSelection", request)
+            response = self.send_get_selection(request)
 
             # Process the response
             selected_items = []
@@ -911,10 +891,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Dictionary containing updated selection information
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-            
             if not item_ids or len(item_ids) == 0:
                 return {
                     "error": "No item IDs provided",
@@ -944,7 +920,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
                 request.item_ids.append(kiid)
             
             # Send the actual IPC command to KiCad
-            response = self.send_schematic_command("AddToSelection", request)
+            response = self.send_add_to_selection(request)
             
             return {
                 "api_endpoint": "AddToSelection",
@@ -984,10 +960,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Dictionary containing operation result
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from google.protobuf.empty_pb2 import Empty
-            
             # Get the active schematic document
             doc_spec = self.get_active_schematic_document()
             if not doc_spec:
@@ -1005,7 +977,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             
             # Send the actual IPC command to KiCad
             # ClearSelection returns Empty response
-            response = self.send_schematic_command("ClearSelection", request)
+            response = self.send_clear_selection(request)
             
             return {
                 "api_endpoint": "ClearSelection",
@@ -1047,11 +1019,6 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             dict: Dictionary containing selection results and counts by type
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            from kipy.proto.common.types import base_types_pb2
-            
             if not item_types or len(item_types) == 0:
                 return {
                     "error": "No item types provided",
@@ -1076,7 +1043,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             get_items_request = schematic_commands_pb2.GetSchematicItems()
             get_items_request.schematic.CopyFrom(doc_spec)
             
-            items_response = self.send_schematic_command("GetSchematicItems", get_items_request)
+            items_response = self.send_get_schematic_items(get_items_request)
             
             # Track original user request for layer-based filtering
             # Wire = electrical lines (layer 1), Line = graphical lines (layer 3)
@@ -1175,7 +1142,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
             # Clear existing selection first
             clear_request = schematic_commands_pb2.ClearSelection()
             clear_request.schematic.CopyFrom(doc_spec)
-            self.send_schematic_command("ClearSelection", clear_request)
+            self.send_clear_selection(clear_request)
             
             # Now add all matching items to selection
             select_request = schematic_commands_pb2.AddToSelection()
@@ -1187,7 +1154,7 @@ class SchematicAnalyzer(ToolManager, SchematicTool):
                 select_request.item_ids.append(kiid)
             
             # Send the selection request
-            select_response = self.send_schematic_command("AddToSelection", select_request)
+            select_response = self.send_add_to_selection(select_request)
             
             return {
                 "api_endpoint": "select_by_type",
@@ -1,7 +1,8 @@
-from typing import Dict
+from google.protobuf.any_pb2 import Any
+from kipy.proto.schematic import schematic_commands_pb2
+from kipy.proto.schematic import schematic_types_pb2
 
 from ..schematicmodule import SchematicTool
-from ...core.ActionFlowManager import ActionFlowManager
 from ...core.mcp_manager import ToolManager
 from ...utils.validation import (
     ValidationError,
@@ -224,11 +225,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
                     "optimization": "✅ Parameter redundancy eliminated - no item_type required"
                 }
 
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            from kipy.proto.common.types import base_types_pb2
-
             # Validate parameters using cached config
             validation_result = self._validate_create_args(item_type, args)
             if validation_result:
@@ -383,9 +379,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
                 return validation_error
             
             # Call the DrawWire API
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-            
             request = schematic_commands_pb2.DrawWire()
             
             # Set start point
@@ -406,7 +399,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
                 request.schematic.CopyFrom(doc_spec)
             
             # Send the request to KiCad
-            response = self.send_schematic_command("DrawWire", request)
+            response = self.send_draw_wire(request)
             
             if response and hasattr(response, 'wire_id'):
                 return {
@@ -482,11 +475,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
     def _create_junction(self, doc_spec, args):
         """Create a junction using CreateSchematicItems API."""
         try:
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            from kipy.proto.common.types import base_types_pb2
-            from google.protobuf.any_pb2 import Any
-            
             # Create Junction message
             junction = schematic_types_pb2.Junction()
             junction.position.x_nm = args["position"]["x_nm"]
@@ -519,7 +507,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
             request.items.append(any_item)
             
             # Send the request to KiCad
-            response = self.send_schematic_command("CreateSchematicItems", request)
+            response = self.send_create_schematic_items(request)
             
             if response and hasattr(response, 'created_ids') and len(response.created_ids) > 0:
                 item_id = response.created_ids[0].value if response.created_ids[0].value else "unknown"
@@ -555,9 +543,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
     def _create_wire_internal(self, doc_spec, args):
         """Create a wire using DrawWire API - internal method for direct functions."""
         try:
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-
             request = schematic_commands_pb2.DrawWire()
 
             # Set start point
@@ -578,7 +563,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
             request.schematic.CopyFrom(doc_spec)
 
             # Execute the DrawWire command
-            response = self.send_schematic_command("DrawWire", request)
+            response = self.send_draw_wire(request)
 
             if response and hasattr(response, 'wire_id'):
                 return {
@@ -607,11 +592,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
     def _create_label(self, doc_spec, item_type: str, args):
         """Create a label (Local or Global) using CreateSchematicItems API.""" 
         try:
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            from kipy.proto.common.types import base_types_pb2
-            from google.protobuf.any_pb2 import Any
-            
             # Create appropriate label type
             if item_type == "LocalLabel":
                 label = schematic_types_pb2.LocalLabel()
@@ -649,7 +629,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
             request.items.append(any_item)
             
             # Send the request to KiCad
-            response = self.send_schematic_command("CreateSchematicItems", request)
+            response = self.send_create_schematic_items(request)
             
             if response and hasattr(response, 'created_ids') and len(response.created_ids) > 0:
                 item_id = response.created_ids[0].value if response.created_ids[0].value else "unknown"
@@ -685,11 +665,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
     def _create_text(self, doc_spec, args):
         """Create text annotation using CreateSchematicItems API."""
         try:
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            from kipy.proto.common.types import base_types_pb2
-            from google.protobuf.any_pb2 import Any
-            
             # Create Text message
             text_item = schematic_types_pb2.Text()
             text_item.position.x_nm = args["position"]["x_nm"]
@@ -720,7 +695,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
             request.items.append(any_item)
             
             # Send the request to KiCad
-            response = self.send_schematic_command("CreateSchematicItems", request)
+            response = self.send_create_schematic_items(request)
             
             if response and hasattr(response, 'created_ids') and len(response.created_ids) > 0:
                 item_id = response.created_ids[0].value if response.created_ids[0].value else "unknown"
@@ -817,12 +792,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
             Result of graphical line creation
         """
         try:
-            # Import protocol buffer messages
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.schematic import schematic_types_pb2
-            from kipy.proto.common.types import base_types_pb2
-            from google.protobuf.any_pb2 import Any
-
             # Validate input parameters
             if not isinstance(start_point, dict) or not all(k in start_point for k in ["x_nm", "y_nm"]):
                 return {
@@ -863,7 +832,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
             request.items.append(line_any)
 
             # Send command to KiCad
-            response = self.send_schematic_command("CreateSchematicItems", request)
+            response = self.send_create_schematic_items(request)
 
             if len(response.created_ids) > 0:
                 line_id = response.created_ids[0].value
@@ -1302,9 +1271,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
                     }
 
             # Call the PlaceSymbol API
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-
             request = schematic_commands_pb2.PlaceSymbol()
 
             # Set library and symbol names
@@ -1351,7 +1317,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
                 }
 
             # Send the request to KiCad
-            response = self.send_schematic_command("PlaceSymbol", request)
+            response = self.send_place_symbol(request)
 
             if response and hasattr(response, 'symbol_id') and not response.error:
                 return {
@@ -1425,9 +1391,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
         """
         try:
             # Call the PlaceSymbol API directly
-            from kipy.proto.schematic import schematic_commands_pb2
-            from kipy.proto.common.types import base_types_pb2
-
             request = schematic_commands_pb2.PlaceSymbol()
 
             # Set all parameters directly
@@ -1461,7 +1424,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
                 }
 
             # Send the request to KiCad
-            response = self.send_schematic_command("PlaceSymbol", request)
+            response = self.send_place_symbol(request)
 
             if response and hasattr(response, 'symbol_id') and not response.error:
                 return {
@@ -1509,8 +1472,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
             dict: Available symbol libraries
         """
         try:
-            from kipy.proto.schematic import schematic_commands_pb2
-
             request = schematic_commands_pb2.GetSymbolLibraries()
             request.power_symbols_only = power_only
 
@@ -1520,7 +1481,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
                 request.schematic.CopyFrom(doc_spec)
 
             # Send the request to KiCad
-            response = self.send_schematic_command("GetSymbolLibraries", request)
+            response = self.send_get_symbol_libraries(request)
 
             if response and not response.error:
                 return {
@@ -1581,8 +1542,6 @@ class SchematicManipulator(ToolManager, SchematicTool):
             dict: Symbol search results
         """
         try:
-            from kipy.proto.schematic import schematic_commands_pb2
-
             request = schematic_commands_pb2.SearchSymbols()
             request.search_text = search_text
             request.power_symbols_only = power_only
@@ -1597,7 +1556,7 @@ class SchematicManipulator(ToolManager, SchematicTool):
                 request.schematic.CopyFrom(doc_spec)
 
             # Send the request to KiCad
-            response = self.send_schematic_command("SearchSymbols", request)
+            response = self.send_search_symbols(request)
 
             if response and not response.error:
                 return {
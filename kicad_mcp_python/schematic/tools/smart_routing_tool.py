@@ -5,7 +5,8 @@ This module exposes our smart routing implementation as MCP tools that Claude ca
 to create intelligent wire connections in KiCad schematics.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any
+from kipy.proto.schematic import schematic_commands_pb2
 from ...tools.smart_wire_tool import SmartWireTool
 from ..schematicmodule import SchematicTool
 from ...core.mcp_manager import ToolManager
@@ -219,10 +220,6 @@ class SchematicSmartRouter(ToolManager, SchematicTool):
                 # Create the actual wires in KiCad
                 wire_creation_results = []
                 for segment in result.get('wire_segments', []):
-                    # Import here to avoid circular dependency
-                    from kipy.proto.schematic import schematic_commands_pb2
-                    from kipy.proto.common.types import base_types_pb2
-                    
                     # Get the active schematic document
                     doc_spec = self.get_active_schematic_document()
                     if not doc_spec:
@@ -237,7 +234,7 @@ class SchematicSmartRouter(ToolManager, SchematicTool):
                     request.end_point.y_nm = segment['end_point']['y_nm']
                     
                     # Send wire creation command
-                    response = self.send_schematic_command("DrawWire", request)
+                    response = self.send_draw_wire(request)
                     
                     if response.wire_id.value:
                         wire_creation_results.append({
@@ -301,7 +298,7 @@ class SchematicSmartRouter(ToolManager, SchematicTool):
             Analysis of the routing path with quality metrics
         """
         try:
-            from ..smart_routing import Position, SmartRoutingEngine
+            from ..smart_routing import Position
             
             # Create position objects
             start = Position(start_pos['x_nm'], start_pos['y_nm'])
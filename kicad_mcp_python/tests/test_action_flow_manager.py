@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("kipy")
+
+from mcp.server.fastmcp import FastMCP
+
+from kicad_mcp_python.core.ActionFlowManager import ActionFlowManager
+from kicad_mcp_python.core.mcp_manager import no_board_required
+
+
+@no_board_required
+def step_1():
+    """First step"""
+    return "one"
+
+
+@no_board_required
+def step_2():
+    """Second step"""
+    return "two"
+
+
+def test_response_names_the_successor_of_the_action_that_ran():
+    mcp = FastMCP("test")
+    manager = ActionFlowManager(mcp)
+    manager.action_setter(step_1)
+    manager.action_setter(step_2)
+
+    first = mcp._tool_manager.get_tool("step_1").fn()
+    assert first["result"] == "one"
+    assert first["next_action"] == "step_2"
+    assert first["next_action_info"] == "Next execution: step_2"
+
+    last = mcp._tool_manager.get_tool("step_2").fn()
+    assert last["next_action"] is None
+    assert last["next_action_info"] == "Flow complete"
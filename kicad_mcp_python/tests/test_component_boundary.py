@@ -0,0 +1,238 @@
+import random
+
+import numpy as np
+import pytest
+
+from kicad_mcp_python.schematic.component_boundary import (
+    AdvancedCollisionDetector,
+    ComponentBoundaryManager,
+    integrate_with_kicad_api,
+)
+from kicad_mcp_python.schematic.spatial_index import STRIndex
+from kicad_mcp_python.schematic.smart_routing import (
+    Pin,
+    Position,
+    RoutingMode,
+    RoutingPath,
+    Symbol,
+)
+
+
+def make_symbol(symbol_id, x_nm, y_nm):
+    return Symbol(
+        id=symbol_id,
+        reference=symbol_id,
+        value="1k",
+        position=Position(x_nm, y_nm),
+        orientation_degrees=0,
+        pins=[
+            Pin(f"{symbol_id}-1", "1", "1", Position(x_nm - 5000000, y_nm), 0, 4, 25400),
+            Pin(f"{symbol_id}-2", "2", "2", Position(x_nm + 5000000, y_nm), 2, 4, 25400),
+        ],
+    )
+
+
+def make_path(*points):
+    return RoutingPath(
+        start_pin=None,
+        end_pin=None,
+        segments=list(zip(points, points[1:])),
+        total_length=0,
+        mode=RoutingMode.MANHATTAN,
+    )
+
+
+def test_check_path_collision_hits_and_excludes():
+    manager = ComponentBoundaryManager()
+    manager.add_component_boundary(make_symbol("R1", 100000000, 100000000))
+    manager.add_component_boundary(make_symbol("R2", 100000000, 200000000))
+
+    path = make_path(Position(80000000, 100000000), Position(120000000, 100000000))
+
+    result = manager.check_path_collision(path)
+    assert result.has_collision
+    assert result.colliding_components == ["R1"]
+
+    result = manager.check_path_collision(path, exclude_pins={"R1"})
+    assert not result.has_collision
+
+
+def test_check_path_collision_matches_bounding_box_clipping():
+    rng = random.Random(1234)
+    manager = ComponentBoundaryManager(clearance_nm=0)
+    for i in range(40):
+        manager.add_component_boundary(
+            make_symbol(f"U{i}", rng.randrange(0, 300000000), rng.randrange(0, 300000000))
+        )
+
+    for _ in range(200):
+        start = Position(rng.randrange(0, 300000000), rng.randrange(0, 300000000))
+        end = Position(rng.randrange(0, 300000000), rng.randrange(0, 300000000))
+        expected = {
+            symbol_id for symbol_id, bbox in manager.component_boundaries.items()
+            if bbox.intersects_line(start, end)
+        }
+        result = manager.check_path_collision(make_path(start, end))
+        assert set(result.colliding_components) == expected
+
+
+@pytest.mark.parametrize("count", [0, 1, 15, 17, 300, 5000])
+def test_str_index_matches_linear_scan(count):
+    rng = np.random.default_rng(count)
+    mins = rng.integers(0, 1000000, size=(count, 2))
+    boxes = np.hstack((mins, mins + rng.integers(0, 20000, size=(count, 2))))
+    index = STRIndex(boxes)
+
+    for _ in range(50):
+        x0, y0 = rng.integers(0, 1000000, size=2)
+        x1, y1 = x0 + rng.integers(0, 100000), y0 + rng.integers(0, 100000)
+        expected = np.flatnonzero(
+            (boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0)
+        )
+        assert index.query(x0, y0, x1, y1).tolist() == expected.tolist()
+
+
+def test_find_components_in_region_keeps_insertion_order():
+    manager = ComponentBoundaryManager()
+    for i in range(50):
+        manager.add_component_boundary(make_symbol(f"R{i}", (49 - i) * 20000000, 0))
+
+    found = manager.find_components_in_region(Position(0, -1000000), Position(200000000, 1000000))
+    assert [bbox.symbol_id for bbox in found] == [f"R{i}" for i in range(39, 50)]
+
+
+def test_fast_collision_check_uses_spatial_index():
+    detector = AdvancedCollisionDetector()
+    assert not detector.fast_collision_check(make_path(Position(0, 0), Position(1000, 0)))
+
+    detector.build_spatial_index([make_symbol("R1", 100000000, 100000000)])
+    path = make_path(Position(80000000, 100000000), Position(120000000, 100000000))
+    assert detector.fast_collision_check(path)
+    assert not detector.fast_collision_check(path, exclude_pins={"R1"})
+
+
+def test_numba_kernel_matches_numpy_fallback():
+    pytest.importorskip("numba")
+    from kicad_mcp_python.schematic import component_boundary
+    from kicad_mcp_python.schematic._geometry_kernels import collide_segments_bboxes
+
+    rng = np.random.default_rng(7)
+    top_left = rng.integers(0, 1000000, size=(64, 2))
+    bottom_right = top_left + rng.integers(0, 50000, size=(64, 2))
+    seg_starts = rng.integers(0, 1000000, size=(20, 2))
+    seg_ends = seg_starts.copy()
+    seg_ends[::2, 0] = rng.integers(0, 1000000, size=10)   # horizontal segments
+    seg_ends[1::2] = rng.integers(0, 1000000, size=(10, 2))  # arbitrary segments
+
+    expected = np.array([
+        component_boundary._segment_box_hits(s, e, top_left - 1000, bottom_right + 1000)
+        for s, e in zip(seg_starts, seg_ends)
+    ])
+    assert (collide_segments_bboxes(seg_starts, seg_ends, top_left, bottom_right, 1000) == expected).all()
+
+
+def test_add_component_boundary_replaces_existing_symbol():
+    manager = ComponentBoundaryManager()
+    manager.add_component_boundary(make_symbol("R1", 0, 0))
+    manager.add_component_boundary(make_symbol("R1", 100000000, 0))
+
+    boundaries = manager.component_boundaries
+    assert list(boundaries) == ["R1"]
+    assert boundaries["R1"].center == Position(100000000, 0)
+    assert manager.find_components_in_region(Position(-1000000, -1000000), Position(1000000, 1000000)) == []
+
+
+def test_check_path_collision_follows_clearance_changes():
+    manager = ComponentBoundaryManager(clearance_nm=0)
+    manager.add_component_boundary(make_symbol("R1", 100000000, 100000000))
+
+    # Passes 1mm above the body margin of R1
+    path = make_path(Position(80000000, 98365000), Position(120000000, 98365000))
+    assert not manager.check_path_collision(path).has_collision
+
+    manager.clearance_nm = 2000000
+    assert manager.check_path_collision(path).has_collision
+
+
+def test_optimize_routing_corridor_sums_obstacles():
+    manager = ComponentBoundaryManager()
+    manager.add_component_boundary(make_symbol("R1", 100000000, 100000000))
+    manager.add_component_boundary(make_symbol("R2", 100000000, 300000000))
+
+    corridor = manager.optimize_routing_corridor(Position(80000000, 90000000), Position(120000000, 110000000))
+    bbox = manager.component_boundaries["R1"]
+    assert corridor["components_in_path"] == ["R1"]
+    assert corridor["component_count"] == 1
+    assert corridor["obstacle_density"] == bbox.width * bbox.height / (40000000 * 20000000)
+    assert corridor["suggested_strategy"] == "direct"
+
+
+def test_integrate_with_kicad_api_adds_every_symbol():
+    symbols_data = [
+        {
+            "id": f"U{i}",
+            "reference": f"U{i}",
+            "value": "1k",
+            "position": {"x_nm": i * 50000000, "y_nm": 0},
+            "orientation_degrees": 0,
+            "pins": [
+                {"id": f"U{i}-1", "name": "1", "number": "1",
+                 "position": {"x_nm": i * 50000000 - 5000000, "y_nm": 0},
+                 "orientation": 0, "electrical_type": 4, "length": 25400},
+            ],
+        }
+        for i in range(3)
+    ]
+    manager = ComponentBoundaryManager()
+    integrate_with_kicad_api(symbols_data, manager)
+    assert list(manager.component_boundaries) == ["U0", "U1", "U2"]
+
+
+def test_suggest_detour_points_routes_around_component():
+    manager = ComponentBoundaryManager()
+    manager.add_component_boundary(make_symbol("R1", 100000000, 100000000))
+    bbox = manager.component_boundaries["R1"]
+
+    above = manager.suggest_detour_points(Position(80000000, 90000000), Position(120000000, 90000000), bbox)
+    detour_y = bbox.top_left.y_nm - 2 * manager.clearance_nm
+    assert above == [Position(80000000, detour_y), Position(120000000, detour_y)]
+
+    result = manager.check_path_collision(make_path(Position(80000000, 100000000), Position(120000000, 100000000)))
+    assert result.collision_points == [bbox.center]
+
+
+def test_add_component_boundaries_matches_sequential_adds():
+    rng = random.Random(13)
+    symbols = []
+    for i in range(60):
+        x, y = rng.randint(-10**8, 10**8), rng.randint(-10**8, 10**8)
+        pins = [
+            Pin(f"S{i}-{k}", "", str(k), Position(x + rng.randint(-10**7, 10**7), y + rng.randint(-10**7, 10**7)),
+                0, 4, 25400)
+            for k in range(rng.choice([0, 0, 1, 2, 5]))
+        ]
+        # Some ids repeat, so later entries replace earlier ones
+        symbols.append(Symbol(id=f"S{rng.randint(0, 40)}", reference="", value="",
+                              position=Position(x, y), orientation_degrees=0, pins=pins))
+
+    sequential = ComponentBoundaryManager()
+    for symbol in symbols:
+        sequential.add_component_boundary(symbol)
+    batched = ComponentBoundaryManager()
+    batched.add_component_boundaries(symbols[:7])
+    batched.add_component_boundaries(symbols[7:])
+
+    assert batched.component_boundaries == sequential.component_boundaries
+    count = sequential._count
+    last = {symbol.id: symbol for symbol in symbols}
+    for symbol_id, bbox in batched.component_boundaries.items():
+        symbol = last[symbol_id]
+        if symbol.pins:
+            xs = [pin.position.x_nm for pin in symbol.pins]
+            ys = [pin.position.y_nm for pin in symbol.pins]
+            expected = (min(xs) - 635000, min(ys) - 635000, max(xs) + 635000, max(ys) + 635000)
+        else:
+            x, y = symbol.position.x_nm, symbol.position.y_nm
+            expected = (x - 1270000, y - 1270000, x + 1270000, y + 1270000)
+        assert (bbox.top_left.x_nm, bbox.top_left.y_nm, bbox.bottom_right.x_nm, bbox.bottom_right.y_nm) == expected
+    assert np.array_equal(batched._centers[:count], sequential._centers[:count])
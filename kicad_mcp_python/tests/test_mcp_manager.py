@@ -0,0 +1,29 @@
+from mcp.server.fastmcp import FastMCP
+
+from kicad_mcp_python.core.mcp_manager import ToolManager, no_board_required
+
+
+class _Manager(ToolManager):
+    def __init__(self, mcp: FastMCP):
+        super().__init__(mcp)
+        self._register_tool()
+
+    # Same hook name the PCB managers use for their own registration
+    def _register_tool(self):
+        self.add_tool(self.echo)
+
+    @no_board_required
+    def echo(self, text: str):
+        """Returns text unchanged"""
+        return text
+
+
+def test_add_tool_registers_alongside_a_subclass_register_tool():
+    mcp = FastMCP("test")
+    manager = _Manager(mcp)
+
+    tool = mcp._tool_manager.get_tool("echo")
+    assert tool is not None
+    assert tool.description == "Returns text unchanged"
+    assert tool.fn(text="hi") == "hi"
+    assert manager.mcp is mcp
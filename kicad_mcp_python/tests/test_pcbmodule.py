@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("kipy")
+
+from kipy.errors import ConnectionError as KiCadConnectionError
+from mcp.server.fastmcp import FastMCP
+
+from kicad_mcp_python.core.mcp_manager import ToolManager
+from kicad_mcp_python.pcb import pcbmodule
+from kicad_mcp_python.pcb.pcbmodule import PCBTool
+
+
+class _Board:
+    name = "test.kicad_pcb"
+
+    def __init__(self, alive=True):
+        self.alive = alive
+
+    def get_footprints(self):
+        if not self.alive:
+            raise KiCadConnectionError("KiCad is not responding")
+        return []
+
+
+class _Manager(ToolManager, PCBTool):
+    def __init__(self, mcp):
+        super().__init__(mcp)
+        self.add_tool(self.count_footprints)
+
+    def count_footprints(self):
+        """Counts footprints on the board"""
+        return len(self.board.get_footprints())
+
+
+def test_connection_error_drops_the_cached_board(monkeypatch, tmp_path):
+    # An unchanged file on disk would otherwise keep the dead handle cached
+    pcb_file = tmp_path / "test.kicad_pcb"
+    pcb_file.write_text("")
+    boards = [_Board(alive=False), _Board()]
+    monkeypatch.setattr(pcbmodule, "KiCad", lambda: type("K", (), {"get_board": lambda self: boards.pop(0)})())
+    monkeypatch.setattr(PCBTool, "_resolve_board_path", lambda self: str(pcb_file))
+
+    mcp = FastMCP("test")
+    manager = _Manager(mcp)
+    tool = mcp._tool_manager.get_tool("count_footprints")
+
+    assert tool.fn() == "KiCad is not responding"
+    assert manager.board is None
+
+    assert tool.fn() == 0
+    assert boards == []
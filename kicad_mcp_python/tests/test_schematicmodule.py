@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+pytest.importorskip("kipy")
+
+from kipy.errors import ConnectionError as KiCadConnectionError
+from kipy.proto.schematic import schematic_commands_pb2
+
+from kicad_mcp_python.schematic import schematicmodule
+from kicad_mcp_python.schematic.schematicmodule import SchematicTool
+
+
+class _KiCad:
+    def __init__(self, alive=True, timeout_ms=None):
+        self.alive = alive
+        self.sent = []
+        self._client = self
+
+    def ping(self):
+        if not self.alive:
+            raise KiCadConnectionError("KiCad is not responding")
+
+    def send(self, request, response_type):
+        self.sent.append(request)
+        if not self.alive:
+            raise KiCadConnectionError("KiCad is not responding")
+        return response_type()
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    reconnected = []
+    monkeypatch.setattr(schematicmodule, "KiCad", lambda **kwargs: reconnected.append(_KiCad()) or reconnected[-1])
+    tool = SchematicTool()
+    tool.kicad = _KiCad(alive=False)
+    tool._last_ping_ts = time.monotonic()
+    tool.reconnected = reconnected
+    return tool
+
+
+def test_read_only_command_is_retried_after_reconnect(tool):
+    request = schematic_commands_pb2.GetSelection()
+    response = tool._send(request, schematic_commands_pb2.SelectionResponse)
+
+    assert isinstance(response, schematic_commands_pb2.SelectionResponse)
+    assert tool.reconnected[0].sent == [request]
+
+
+def test_mutating_command_reconnects_without_resending(tool):
+    request = schematic_commands_pb2.ClearSelection()
+    with pytest.raises(KiCadConnectionError):
+        tool._send(request, schematic_commands_pb2.SelectionResponse)
+
+    assert tool.kicad is tool.reconnected[0]
+    assert tool.kicad.sent == []
@@ -0,0 +1,628 @@
+import logging
+import random
+
+import numpy as np
+import pytest
+
+from kicad_mcp_python.schematic import smart_routing
+from kicad_mcp_python.schematic.smart_routing import (
+    BUS_DTYPE, WIRE_DTYPE, AnchorType, BusCandidateSet, Pin, Position, RoutingMode, SmartRoutingEngine, SmartRoutingMCPIntegration,
+    Symbol,
+    _axis_segment_vs_aabb, _segments_hit_aabbs,
+)
+
+
+def test_position_arithmetic():
+    a = Position(5000000, 2000000)
+    b = Position(1000000, 7000000)
+
+    assert a - b == Position(4000000, -5000000)
+    assert a + b == Position(6000000, 9000000)
+    assert (a - b) + b == a
+    assert Position(0, 0).distance_to(Position(300000000, -400000000)) == 500000000
+
+
+def test_find_routing_anchors_matches_pin_scan():
+    engine = SmartRoutingEngine()
+    pins = [
+        Pin(id=f"p{i}", name="", number=str(i), position=Position(x, y),
+            orientation=0, electrical_type=0, length=0)
+        for i, (x, y) in enumerate([(0, 0), (300000, 400000), (700000, 0), (-200000, 100000), (1000000, 1000000)])
+    ]
+    symbols = [Symbol(id="U1", reference="U1", value="", position=Position(0, 0),
+                      orientation_degrees=0.0, pins=pins)]
+    origin = Position(100000, 0)
+
+    anchors = engine.find_routing_anchors(origin, symbols)
+
+    expected = sorted(
+        (origin.distance_to(pin.position), pin.id)
+        for pin in pins
+        if origin.distance_to(pin.position) <= engine.snap_range_nm
+    )
+    pin_anchors = [a for a in anchors if a.anchor_type == AnchorType.PIN]
+    assert [(a.distance, a.item_id) for a in pin_anchors] == expected
+    assert all(a.distance_sq == origin.distance_sq_to(a.position) for a in anchors)
+    assert anchors[-1].anchor_type == AnchorType.GRID
+
+
+def test_snap_range_square_follows_setter():
+    engine = SmartRoutingEngine()
+    engine.snap_range_nm = 1000
+    assert engine._snap_range_sq == 1000000
+    assert Position(0, 0).distance_sq_to(Position(3, 4)) == 25
+
+
+def test_compute_break_point_modes():
+    engine = SmartRoutingEngine()
+    start, end = Position(0, 0), Position(10, 4)
+
+    # Manhattan breaks along the longer axis unless a direction is preferred
+    assert engine.compute_break_point(start, end) == Position(10, 0)
+    assert engine.compute_break_point(start, end, prefer_vertical=True) == Position(0, 4)
+    assert engine.compute_break_point(start, end, RoutingMode.DIRECT) is end
+
+    # 45-degree: the diagonal takes up the shorter axis
+    assert engine.compute_break_point(start, end, RoutingMode.ANGLE_45) == Position(6, 0)
+    # A vertical preference would run backwards here, so it falls back to horizontal
+    assert engine.compute_break_point(start, end, RoutingMode.ANGLE_45, prefer_vertical=True) == Position(6, 0)
+
+
+def test_position_is_immutable_and_hashable():
+    p = Position(1, 2)
+    with pytest.raises(AttributeError):
+        p.x_nm = 3
+    assert {p: "a"}[Position(1, 2)] == "a"
+
+
+def test_convert_mcp_symbols_batch():
+    mcp_symbol = {
+        "id": "sym1", "reference": "R1", "value": "1k", "orientation_degrees": 90.0,
+        "position": {"x_nm": 1000, "y_nm": 2000},
+        "pins": [
+            {"id": "p1", "name": "~", "number": "1", "position": {"x_nm": 0, "y_nm": 2000},
+             "orientation": 0, "electrical_type": 4, "length": 254},
+            {"id": "p2", "name": "~", "number": "2", "position": {"x_nm": 2000, "y_nm": 2000},
+             "orientation": 2, "electrical_type": 4, "length": 254},
+        ],
+    }
+    integration = SmartRoutingMCPIntegration()
+
+    [symbol] = integration.convert_mcp_symbols_batch([mcp_symbol])
+
+    assert symbol.position == Position(1000, 2000)
+    assert [(p.id, p.position, p.orientation, p.symbol_reference) for p in symbol.pins] == [
+        ("p1", Position(0, 2000), 0, "R1"),
+        ("p2", Position(2000, 2000), 2, "R1"),
+    ]
+    assert integration.convert_mcp_symbol_to_routing_symbol(mcp_symbol) == symbol
+
+
+def test_grid_anchor_snaps_with_integer_math():
+    engine = SmartRoutingEngine()
+    grid = engine.grid_size_nm
+
+    for x, expected in [(0, 0), (grid // 2 - 1, 0), (grid // 2, grid), (-grid // 2 - 1, -grid),
+                        (-1, 0), (3 * grid + 1, 3 * grid), (10**6 * grid + 1, 10**6 * grid)]:
+        [anchor] = engine.find_routing_anchors(Position(x, 0), [])
+        assert anchor.position == Position(expected, 0)
+        # Repeated snaps to the same grid point share one Position
+        assert engine.find_routing_anchors(Position(x, 0), [])[0].position is anchor.position
+
+
+def test_route_wire_with_avoidance_takes_the_clear_corner():
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=1,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="1", position=Position(50000000, 30000000), orientation=1,
+              electrical_type=0, length=0, symbol_reference="U2")
+    default = engine.generate_manhattan_path(start, end)
+    corner = default.segments[0][1]
+
+    # Block the default corner with a third symbol
+    blocker = Symbol(id="U3", reference="U3", value="", position=corner, orientation_degrees=0.0, pins=[],
+                     bbox=(corner.x_nm - 1000, corner.y_nm - 1000, corner.x_nm + 1000, corner.y_nm + 1000))
+    path = engine.route_wire_with_avoidance(start, end, [blocker])
+
+    assert path.segments[0][1] != corner
+    assert path.segments[0][0] == start.position and path.segments[-1][1] == end.position
+    assert path.total_length == default.total_length
+
+    # Nothing in the way: unchanged
+    assert engine.route_wire_with_avoidance(start, end, []).segments == default.segments
+
+
+def test_build_obstacle_index_picks_up_moved_bbox():
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=1,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="1", position=Position(50000000, 30000000), orientation=1,
+              electrical_type=0, length=0, symbol_reference="U2")
+    corner = engine.generate_manhattan_path(start, end).segments[0][1]
+    blocker = Symbol(id="U3", reference="U3", value="", position=Position(0, 0), orientation_degrees=0.0,
+                     pins=[], bbox=(-90000000, -90000000, -80000000, -80000000))
+    symbols = [blocker]
+    assert engine.route_wire_with_avoidance(start, end, symbols).segments[0][1] == corner
+
+    # Moved in place: the cached index still has the old box until rebuilt
+    blocker.bbox = (corner.x_nm - 1000, corner.y_nm - 1000, corner.x_nm + 1000, corner.y_nm + 1000)
+    engine.build_obstacle_index(symbols)
+
+    assert engine.route_wire_with_avoidance(start, end, symbols).segments[0][1] != corner
+
+
+def test_find_routing_anchors_pin_grid_matches_brute_force():
+    rng = random.Random(7)
+    engine = SmartRoutingEngine()
+    pins = [
+        Pin(id=f"p{i}", name="", number=str(i),
+            position=Position(rng.randint(-5000000, 5000000), rng.randint(-5000000, 5000000)),
+            orientation=0, electrical_type=0, length=0)
+        for i in range(300)
+    ]
+    symbols = [Symbol(id="U1", reference="U1", value="", position=Position(0, 0),
+                      orientation_degrees=0.0, pins=pins)]
+
+    for pin in rng.sample(pins, 50):
+        query = Position(pin.position.x_nm + rng.randint(-700000, 700000),
+                         pin.position.y_nm + rng.randint(-700000, 700000))
+        expected = [p.id for p in pins if query.distance_to(p.position) <= engine.snap_range_nm]
+        found = [a.item_id for a in engine.find_routing_anchors(query, symbols) if a.anchor_type == AnchorType.PIN]
+        assert sorted(found) == sorted(expected)
+
+
+def test_generate_manhattan_paths_batch_matches_single_pair():
+    rng = np.random.default_rng(11)
+    engine = SmartRoutingEngine()
+    start_xy = rng.integers(-10**8, 10**8, size=(200, 2))
+    end_xy = rng.integers(-10**8, 10**8, size=(200, 2))
+    prefer_h = rng.random(200) < 0.3
+    prefer_v = rng.random(200) < 0.3
+
+    break_xy, lengths = engine.generate_manhattan_paths_batch(start_xy, end_xy, prefer_h, prefer_v)
+
+    for i in range(200):
+        start, end = Position(*start_xy[i].tolist()), Position(*end_xy[i].tolist())
+        bp = engine.compute_break_point(start, end, RoutingMode.MANHATTAN, prefer_h[i], prefer_v[i])
+        assert tuple(break_xy[i]) == (bp.x_nm, bp.y_nm)
+        assert lengths[i] == start.distance_to(bp) + bp.distance_to(end)
+
+
+def test_axis_segment_vs_aabb():
+    box = (10, 10, 20, 20)
+    assert _axis_segment_vs_aabb(0, 15, 30, 15, box)        # horizontal, crossing
+    assert _axis_segment_vs_aabb(0, 20, 10, 20, box)        # touches a corner
+    assert not _axis_segment_vs_aabb(0, 21, 30, 21, box)    # horizontal, above
+    assert not _axis_segment_vs_aabb(0, 15, 9, 15, box)     # horizontal, stops short
+    assert _axis_segment_vs_aabb(15, 30, 15, 0, box)        # vertical, reversed direction
+    assert not _axis_segment_vs_aabb(25, 0, 25, 30, box)    # vertical, beside
+
+
+def test_best_snap_anchor_is_first_ranked_anchor():
+    rng = random.Random(5)
+    engine = SmartRoutingEngine()
+    pins = [
+        Pin(id=f"p{i}", name="", number=str(i),
+            position=Position(rng.randint(-3000000, 3000000), rng.randint(-3000000, 3000000)),
+            orientation=0, electrical_type=0, length=0)
+        for i in range(100)
+    ]
+    symbols = [Symbol(id="U1", reference="U1", value="", position=Position(0, 0),
+                      orientation_degrees=0.0, pins=pins)]
+
+    for _ in range(100):
+        query = Position(rng.randint(-3500000, 3500000), rng.randint(-3500000, 3500000))
+        assert engine.best_snap_anchor(query, symbols) == engine.find_routing_anchors(query, symbols)[0]
+
+
+def test_routing_preferences_by_orientation():
+    engine = SmartRoutingEngine()
+
+    def prefs(start_orientation, end_orientation):
+        start = Pin(id="a", name="", number="1", position=Position(0, 0),
+                    orientation=start_orientation, electrical_type=0, length=0)
+        end = Pin(id="b", name="", number="2", position=Position(50000000, 30000000),
+                  orientation=end_orientation, electrical_type=0, length=0)
+        return engine._get_routing_preferences(start, end)
+
+    assert prefs(0, 2) == prefs(2, 2) == (False, True)
+    assert prefs(1, 3) == prefs(3, 3) == (True, False)
+    assert prefs(0, 1) == prefs(3, 2) == (False, False)
+    assert prefs(7, 0) == (False, False)
+
+
+def test_wire_segments_batch_matches_dicts():
+    integration = SmartRoutingMCPIntegration()
+    engine = integration.engine
+
+    def pin(pin_id, x, y):
+        return Pin(id=pin_id, name="", number="1", position=Position(x, y),
+                   orientation=0, electrical_type=0, length=0)
+
+    paths = [
+        engine.generate_manhattan_path(pin("a", 0, 0), pin("b", 5080000, 2540000)),
+        engine.generate_manhattan_path(pin("c", 0, 0), pin("d", 0, 2540000)),
+    ]
+    wires = integration.create_smart_wire_segments_batch(paths)
+
+    assert wires.dtype == WIRE_DTYPE
+    assert len(wires) == sum(len(path.segments) for path in paths)
+    dicts = integration.create_smart_wire_segments(paths[0]) + integration.create_smart_wire_segments(paths[1])
+    for record, segment in zip(wires.tolist(), dicts):
+        assert record[:4] == (segment["start_point"]["x_nm"], segment["start_point"]["y_nm"],
+                              segment["end_point"]["x_nm"], segment["end_point"]["y_nm"])
+        assert record[5] == segment["segment_index"]
+        assert segment["routing_mode"] == RoutingMode.MANHATTAN.value
+    assert integration.create_smart_wire_segments_batch([]).shape == (0,)
+
+
+def test_repeated_manhattan_paths_share_geometry_not_objects():
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=0,
+                electrical_type=0, length=0)
+    end = Pin(id="b", name="", number="2", position=Position(7620000, 5080000), orientation=1,
+              electrical_type=0, length=0)
+
+    first = engine.generate_manhattan_path(start, end)
+    second = engine.generate_manhattan_path(start, end)
+
+    assert first is not second and first.segments is not second.segments
+    assert first.segments == second.segments
+    assert first.total_length == 7620000 + 5080000
+    assert first.quality_score == pytest.approx(1000000.0 / (first.total_length + 1.0))
+    first.segments.append((end.position, end.position))
+    assert len(engine.generate_manhattan_path(start, end).segments) == 2
+
+
+def test_routing_preferences_batch_matches_single_pair():
+    rng = random.Random(11)
+    engine = SmartRoutingEngine()
+    grid = engine.grid_size_nm
+    pairs = [
+        (Pin(id="a", name="", number="1",
+             position=Position(rng.randint(-5, 5) * grid // 2, rng.randint(-5, 5) * grid // 2),
+             orientation=rng.randint(-1, 4), electrical_type=0, length=0),
+         Pin(id="b", name="", number="2",
+             position=Position(rng.randint(-5, 5) * grid // 2, rng.randint(-5, 5) * grid // 2),
+             orientation=rng.randint(-1, 4), electrical_type=0, length=0))
+        for _ in range(500)
+    ]
+
+    prefer_h, prefer_v = engine.routing_preferences_batch(
+        [(s.position.x_nm, s.position.y_nm) for s, _ in pairs],
+        [(e.position.x_nm, e.position.y_nm) for _, e in pairs],
+        [s.orientation for s, _ in pairs],
+        [e.orientation for _, e in pairs],
+    )
+
+    assert list(zip(prefer_h.tolist(), prefer_v.tolist())) == [
+        engine._get_routing_preferences(s, e) for s, e in pairs
+    ]
+
+
+def test_snap_to_grid_batch_matches_grid_anchor():
+    rng = random.Random(3)
+    engine = SmartRoutingEngine()
+    grid = engine.grid_size_nm
+    xy = [(rng.randint(-50 * grid, 50 * grid), rng.choice([grid // 2, -grid // 2, 0, rng.randint(-grid, grid)]))
+          for _ in range(300)]
+
+    snapped = engine.snap_to_grid_batch(xy)
+
+    assert snapped.tolist() == [
+        [anchor.position.x_nm, anchor.position.y_nm]
+        for anchor in (engine._grid_anchor(Position(x, y)) for x, y in xy)
+    ]
+
+
+def test_route_wire_with_avoidance_index_matches_brute_force():
+    rng = random.Random(5)
+    engine = SmartRoutingEngine()
+    symbols = []
+    for i in range(300):
+        x, y = rng.randint(0, 100000000), rng.randint(0, 100000000)
+        symbols.append(Symbol(id=f"U{i}", reference=f"U{i}", value="", position=Position(x, y),
+                              orientation_degrees=0.0, pins=[],
+                              bbox=(x, y, x + rng.randint(0, 3000000), y + rng.randint(0, 3000000))))
+    symbols.append(Symbol(id="X", reference="X", value="", position=Position(0, 0),
+                          orientation_degrees=0.0, pins=[]))
+
+    for _ in range(200):
+        start = Pin(id="a", name="", number="1",
+                    position=Position(rng.randint(0, 100000000), rng.randint(0, 100000000)),
+                    orientation=rng.randint(0, 3), electrical_type=0, length=0,
+                    symbol_reference=f"U{rng.randint(0, 299)}")
+        end = Pin(id="b", name="", number="2",
+                  position=Position(rng.randint(0, 100000000), rng.randint(0, 100000000)),
+                  orientation=rng.randint(0, 3), electrical_type=0, length=0,
+                  symbol_reference=f"U{rng.randint(0, 299)}")
+        endpoints = {start.symbol_reference, end.symbol_reference}
+        obstacles = [s.bbox for s in symbols if s.bbox is not None and s.reference not in endpoints]
+
+        path = engine.route_wire_with_avoidance(start, end, symbols)
+        default = engine.generate_manhattan_path(start, end)
+        if not _segments_hit_aabbs(default.segments, obstacles):
+            assert path.segments == default.segments
+        elif path.segments != default.segments:
+            assert not _segments_hit_aabbs(path.segments, obstacles)
+        else:
+            sx, sy = start.position.x_nm, start.position.y_nm
+            ex, ey = end.position.x_nm, end.position.y_nm
+            corner = (Position(ex, sy) if default.segments[0][1].x_nm == sx else Position(sx, ey))
+            assert _segments_hit_aabbs([(start.position, corner), (corner, end.position)], obstacles)
+
+
+def test_find_routing_anchors_limit_is_prefix_of_full_ranking():
+    rng = random.Random(9)
+    engine = SmartRoutingEngine()
+    engine.snap_range_nm = 2540000
+    # Coarse coordinates so equal distances (ties) are common
+    pins = [
+        Pin(id=f"p{i}", name="", number=str(i),
+            position=Position(rng.randint(-4, 4) * 254000, rng.randint(-4, 4) * 254000),
+            orientation=0, electrical_type=0, length=0)
+        for i in range(200)
+    ]
+    symbols = [Symbol(id="U1", reference="U1", value="", position=Position(0, 0),
+                      orientation_degrees=0.0, pins=pins)]
+
+    full = engine.find_routing_anchors(Position(0, 0), symbols)
+    for limit in (0, 1, 2, 5, 17, len(full), len(full) + 3):
+        assert engine.find_routing_anchors(Position(0, 0), symbols, limit=limit) == full[:limit]
+
+
+def test_angle_45_break_point_without_preference_follows_longer_axis():
+    rng = random.Random(17)
+    engine = SmartRoutingEngine()
+    for _ in range(2000):
+        sx, sy, ex, ey = (rng.randint(-20, 20) * 254000 for _ in range(4))
+        dx, dy = ex - sx, ey - sy
+        x_dir = 1 if dx > 0 else -1
+        y_dir = 1 if dy > 0 else -1
+        if abs(dx) < abs(dy):
+            expected = Position(sx, ey - y_dir * abs(dx))
+        else:
+            expected = Position(ex - x_dir * abs(dy), sy)
+        assert engine.compute_break_point(Position(sx, sy), Position(ex, ey), RoutingMode.ANGLE_45) == expected
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_route_all_matches_single_pair(monkeypatch, use_numba):
+    if use_numba:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(smart_routing, "_load_numba_route_kernel", lambda: None)
+    rng = random.Random(23)
+    engine = SmartRoutingEngine()
+    grid = engine.grid_size_nm
+    pairs = [
+        (Pin(id="a", name="", number="1",
+             position=Position(rng.randint(-40, 40) * grid // 2, rng.randint(-40, 40) * grid // 2),
+             orientation=rng.randint(-1, 4), electrical_type=0, length=0),
+         Pin(id="b", name="", number="2",
+             position=Position(rng.randint(-40, 40) * grid // 2, rng.randint(-40, 40) * grid // 2),
+             orientation=rng.randint(-1, 4), electrical_type=0, length=0))
+        for _ in range(1000)
+    ]
+
+    break_xy, lengths = engine.route_all(
+        [(s.position.x_nm, s.position.y_nm) for s, _ in pairs],
+        [(e.position.x_nm, e.position.y_nm) for _, e in pairs],
+        [s.orientation for s, _ in pairs],
+        [e.orientation for _, e in pairs],
+    )
+
+    for (start, end), (bx, by), length in zip(pairs, break_xy.tolist(), lengths.tolist()):
+        path = engine.generate_manhattan_path(start, end)
+        if len(path.segments) == 1:
+            # In-line pins route straight; the batch break point sits on one end
+            assert Position(bx, by) in (start.position, end.position)
+        else:
+            assert path.segments[0][1] == Position(bx, by)
+        assert path.total_length == length
+
+
+def test_in_line_pins_route_as_one_straight_segment():
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 2540000), orientation=0,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="2", position=Position(7620000, 2540000), orientation=0,
+              electrical_type=0, length=0, symbol_reference="U2")
+
+    path = engine.generate_manhattan_path(start, end)
+
+    assert path.segments == [(start.position, end.position)]
+    assert path.total_length == 7620000
+    assert path.mode == RoutingMode.MANHATTAN
+    blocker = Symbol(id="U3", reference="U3", value="", position=Position(3810000, 2540000),
+                     orientation_degrees=0.0, pins=[], bbox=(3000000, 2000000, 4000000, 3000000))
+    assert engine.route_wire_with_avoidance(start, end, [blocker]).segments == path.segments
+
+
+def test_build_pin_index_picks_up_moved_pins():
+    engine = SmartRoutingEngine()
+    pin = Pin(id="p", name="", number="1", position=Position(0, 0), orientation=0,
+              electrical_type=0, length=0)
+    symbols = [Symbol(id="U1", reference="U1", value="", position=Position(0, 0),
+                      orientation_degrees=0.0, pins=[pin])]
+    far = Position(50000000, 50000000)
+    assert engine.find_routing_anchors(far, symbols, limit=1)[0].anchor_type == AnchorType.GRID
+
+    # Moved in place: the cached index still has the old position until rebuilt
+    pin.position = far
+    engine.build_pin_index(symbols)
+
+    assert engine.find_routing_anchors(far, symbols, limit=1)[0].item_id == "p"
+
+
+def test_bus_aware_routing_logs_instead_of_printing(capsys, caplog):
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=1,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="1", position=Position(20320000, 10160000), orientation=1,
+              electrical_type=0, length=0, symbol_reference="U2")
+    wires = [{
+        "id": "w1", "layer_type": "WIRE", "length_nm": 20320000, "is_vertical": True,
+        "start": {"x_nm": 10160000, "y_nm": 0}, "end": {"x_nm": 10160000, "y_nm": 20320000},
+    }]
+
+    with caplog.at_level(logging.DEBUG, logger=smart_routing.logger.name):
+        engine.generate_bus_aware_manhattan_path(start, end, [], wires)
+
+    assert capsys.readouterr().out == ""
+    messages = [r.getMessage() for r in caplog.records]
+    assert "BUS-AWARE ROUTING:" in messages
+    assert "PATH COMPARISON:" in messages
+    assert "  Direct path length: 30.48mm" in messages
+    assert "  → CHOOSING BUS PATH (>10% improvement)" in messages
+    assert "Selected BUS-AWARE path" in messages
+
+
+def test_vectorized_bus_scoring_matches_per_bus_loop(monkeypatch):
+    engine = SmartRoutingEngine()
+    rng = random.Random(11)
+    wires = []
+    for i in range(40):
+        x, y = rng.randrange(0, 100) * 1270000, rng.randrange(0, 100) * 1270000
+        length = rng.randrange(5, 40) * 1270000
+        horizontal = rng.random() < 0.5
+        end = {"x_nm": x + length, "y_nm": y} if horizontal else {"x_nm": x, "y_nm": y + length}
+        wires.append({"id": f"w{i}", "layer_type": "WIRE", "length_nm": length,
+                      "is_horizontal": horizontal, "is_vertical": not horizontal,
+                      "start": {"x_nm": x, "y_nm": y}, "end": end})
+    buses = engine._analyze_bus_structures(wires)
+
+    for _ in range(50):
+        start = Position(rng.randrange(0, 100) * 1270000, rng.randrange(0, 100) * 1270000)
+        end = Position(rng.randrange(0, 100) * 1270000, rng.randrange(0, 100) * 1270000)
+        vectorized = engine._generate_bus_routing_path(start, end, buses)
+        monkeypatch.setattr(smart_routing, "_VECTOR_BUS_SCORING_MIN", len(buses) + 1)
+        looped = engine._generate_bus_routing_path(start, end, buses)
+        monkeypatch.undo()
+
+        assert vectorized.bus_used == looped.bus_used
+        assert vectorized.segments == looped.segments
+        assert vectorized.total_length == looped.total_length
+
+
+def test_bus_aware_route_cache_returns_fresh_copies():
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=1,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="1", position=Position(50800000, 2540000), orientation=1,
+              electrical_type=0, length=0, symbol_reference="U2")
+    wires = [{"id": "w1", "layer_type": "WIRE", "length_nm": 50800000, "is_horizontal": True,
+              "start": {"x_nm": 0, "y_nm": 2540000}, "end": {"x_nm": 50800000, "y_nm": 2540000}}]
+
+    first = engine.generate_bus_aware_manhattan_path(start, end, [], wires)
+    first.segments.clear()
+    second = engine.generate_bus_aware_manhattan_path(start, end, [], wires)
+
+    assert len(engine._route_cache) == 1
+    assert second == engine._compute_bus_aware_path(start, end, [], engine._analyze_bus_structures(wires))
+    assert second.segments
+
+    # Moving the bus is a different key
+    wires[0]["start"]["y_nm"] = wires[0]["end"]["y_nm"] = 25400000
+    moved = engine.generate_bus_aware_manhattan_path(start, end, [], wires)
+    assert len(engine._route_cache) == 2
+    assert moved == engine._compute_bus_aware_path(start, end, [], engine._analyze_bus_structures(wires))
+
+
+
+def test_bus_aware_route_is_traced_again_when_debug_is_captured(caplog):
+    engine = SmartRoutingEngine()
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=1,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="1", position=Position(50800000, 2540000), orientation=1,
+              electrical_type=0, length=0, symbol_reference="U2")
+    wires = [{"id": "w1", "layer_type": "WIRE", "length_nm": 50800000, "is_horizontal": True,
+              "start": {"x_nm": 0, "y_nm": 2540000}, "end": {"x_nm": 50800000, "y_nm": 2540000}}]
+
+    cached = engine.generate_bus_aware_manhattan_path(start, end, [], wires)
+    assert len(engine._route_cache) == 1
+
+    with caplog.at_level(logging.DEBUG, logger=smart_routing.logger.name):
+        traced = engine.generate_bus_aware_manhattan_path(start, end, [], wires)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "BUS-AWARE ROUTING:" in messages
+    assert "Found 1 bus structures" in messages
+    assert traced == cached
+    assert len(engine._route_cache) == 1
+
+def test_bus_candidate_set_routes_like_the_wire_list():
+    integration = SmartRoutingMCPIntegration()
+    engine = integration.engine
+    start = Pin(id="a", name="", number="1", position=Position(0, 0), orientation=1,
+                electrical_type=0, length=0, symbol_reference="U1")
+    end = Pin(id="b", name="", number="1", position=Position(50800000, 2540000), orientation=1,
+              electrical_type=0, length=0, symbol_reference="U2")
+    wires = [
+        {"id": "w1", "layer_type": "WIRE", "length_nm": 50800000, "is_horizontal": True,
+         "start": {"x_nm": 0, "y_nm": 2540000}, "end": {"x_nm": 50800000, "y_nm": 2540000}},
+        {"id": "short", "layer_type": "WIRE", "length_nm": 1270000, "is_vertical": True,
+         "start": {"x_nm": 0, "y_nm": 0}, "end": {"x_nm": 0, "y_nm": 1270000}},
+        {"id": "line", "layer_type": "GRAPHIC", "length_nm": 50800000, "is_vertical": True,
+         "start": {"x_nm": 0, "y_nm": 0}, "end": {"x_nm": 0, "y_nm": 50800000}},
+    ]
+
+    buses = integration.build_bus_candidates(wires)
+    assert isinstance(buses, BusCandidateSet)
+    assert buses.ids == ["w1"]
+    assert engine._analyze_bus_structures(buses) is buses
+    assert buses.records.dtype == BUS_DTYPE
+    assert buses.records["coord"].tolist() == [2540000]
+
+    from_set = engine.generate_bus_aware_manhattan_path(start, end, [], buses)
+    assert len(engine._route_cache) == 1
+    assert SmartRoutingEngine().generate_bus_aware_manhattan_path(start, end, [], wires) == from_set
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("bus_count", [0, 3, 40])
+def test_batch_route_matches_per_pair_routing(bus_count, use_numba, monkeypatch):
+    if use_numba:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(smart_routing, "_load_numba_route_kernel", lambda: None)
+        monkeypatch.setattr(smart_routing, "_load_numba_bus_kernel", lambda: None)
+    engine = SmartRoutingEngine()
+    rng = random.Random(bus_count)
+    wires = []
+    for i in range(bus_count):
+        x, y = rng.randrange(0, 80) * 1270000, rng.randrange(0, 80) * 1270000
+        length = rng.randrange(5, 40) * 1270000
+        horizontal = rng.random() < 0.5
+        end = {"x_nm": x + length, "y_nm": y} if horizontal else {"x_nm": x, "y_nm": y + length}
+        wires.append({"id": f"w{i}", "layer_type": "WIRE", "length_nm": length,
+                      "is_horizontal": horizontal, "is_vertical": not horizontal,
+                      "start": {"x_nm": x, "y_nm": y}, "end": end})
+
+    def pin(ref):
+        return Pin(id=ref, name="", number="1",
+                   position=Position(rng.randrange(0, 80) * 1270000, rng.randrange(0, 80) * 1270000),
+                   orientation=rng.randrange(4), electrical_type=0, length=0, symbol_reference=ref)
+
+    pairs = [(pin(f"U{i}"), pin(f"R{i}")) for i in range(60)]
+    # An in-line pair takes the single-segment path
+    pairs.append((pairs[0][0], Pin(id="c", name="", number="1", position=Position(0, pairs[0][0].position.y_nm),
+                                   orientation=0, electrical_type=0, length=0, symbol_reference="C1")))
+
+    expected = [engine.generate_bus_aware_manhattan_path(a, b, [], wires) for a, b in pairs]
+    assert engine.batch_route(pairs, wires) == expected
+    assert engine.batch_route([]) == []
+
+
+def test_bus_candidates_sort_longest_first_keeping_input_order():
+    def wire(wire_id, length):
+        # Lengths come from math.hypot in the wire tool, so they are floats
+        return {"id": wire_id, "layer_type": "WIRE", "length_nm": float(length), "is_vertical": True,
+                "start": {"x_nm": 0, "y_nm": 0}, "end": {"x_nm": 0, "y_nm": length}}
+
+    buses = BusCandidateSet.from_wires([wire("a", 6350000), wire("b", 12700000), wire("c", 6350000)])
+
+    assert buses.ids == ["b", "a", "c"]
+    assert buses.records["range_end"].tolist() == [12700000, 6350000, 6350000]
+    assert buses.records["vertical"].all()
+    assert len(BusCandidateSet.from_wires([])) == 0
@@ -13,7 +13,10 @@ Integration points:
 Based on Phase 2 implementation of smart routing enhancement plan.
 """
 
+import io
 import json
+import logging
+import math
 from typing import Dict, Any, List, Optional
 from ..schematic.smart_routing import (
     SmartRoutingMCPIntegration, 
@@ -29,6 +32,9 @@ from ..schematic.component_boundary import (
     BoundingBoxType
 )
 
+# Logger the routing engine traces bus-aware decisions to
+_routing_logger = logging.getLogger(SmartRoutingMCPIntegration.__module__)
+
 
 class SmartWireTool:
     """
@@ -117,13 +123,9 @@ class SmartWireTool:
                 }
             
             # Convert symbols to routing format and update boundary manager
-            all_symbols = []
-            for symbol_data in actual_symbols:
-                symbol = self.routing_engine.convert_mcp_symbol_to_routing_symbol(symbol_data)
-                all_symbols.append(symbol)
-
-                # Add to boundary manager for collision awareness
-                self.boundary_manager.add_component_boundary(symbol, BoundingBoxType.BODY_PINS)
+            all_symbols = self.routing_engine.convert_mcp_symbols_batch(actual_symbols)
+            # Add to boundary manager for collision awareness
+            self.boundary_manager.add_component_boundaries(all_symbols, BoundingBoxType.BODY_PINS)
 
             # PHASE 2 ENHANCEMENT: Extract existing wire structures for bus-aware routing
             existing_wires = self._extract_wire_structures(schematic_items) if schematic_items else []
@@ -150,18 +152,26 @@ class SmartWireTool:
             if routing_mode_enum == RoutingMode.MANHATTAN:
                 # PHASE 3 ENHANCEMENT: Use bus-aware Manhattan routing
                 if existing_wires:
-                    # Capture stdout to get debug messages
-                    import io
-                    import sys
-                    old_stdout = sys.stdout
-                    sys.stdout = debug_capture = io.StringIO()
-
-                    routing_path = self.routing_engine.engine.generate_bus_aware_manhattan_path(
-                        start_pin, end_pin, all_symbols, existing_wires
-                    )
+                    # Capture the routing engine's debug log for this call; it is kept
+                    # out of the server's own log handlers, like the old stdout capture
+                    debug_capture = io.StringIO()
+                    handler = logging.StreamHandler(debug_capture)
+                    handler.setFormatter(logging.Formatter('%(message)s'))
+                    previous_level = _routing_logger.level
+                    previous_propagate = _routing_logger.propagate
+                    _routing_logger.addHandler(handler)
+                    _routing_logger.setLevel(logging.DEBUG)
+                    _routing_logger.propagate = False
+                    try:
+                        routing_path = self.routing_engine.engine.generate_bus_aware_manhattan_path(
+                            start_pin, end_pin, all_symbols,
+                            self.routing_engine.build_bus_candidates(existing_wires)
+                        )
+                    finally:
+                        _routing_logger.removeHandler(handler)
+                        _routing_logger.setLevel(previous_level)
+                        _routing_logger.propagate = previous_propagate
 
-                    # Restore stdout and get debug output
-                    sys.stdout = old_stdout
                     debug_output = debug_capture.getvalue()
                     debug_info["bus_aware_debug_output"] = debug_output.split('\n') if debug_output else []
 
@@ -419,9 +429,7 @@ class SmartWireTool:
 
     def _calculate_wire_length(self, start, end):
         """Calculate length of wire segment in nanometers"""
-        dx = end['x_nm'] - start['x_nm']
-        dy = end['y_nm'] - start['y_nm']
-        return (dx**2 + dy**2)**0.5
+        return math.hypot(end['x_nm'] - start['x_nm'], end['y_nm'] - start['y_nm'])
 
     def _is_horizontal_wire(self, start, end, tolerance=100000):  # 0.1mm tolerance
         """Check if wire is horizontal (within tolerance)"""
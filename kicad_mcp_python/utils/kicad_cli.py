@@ -1,3 +1,4 @@
+import logging
 import os
 import subprocess
 import tempfile
@@ -13,6 +14,8 @@ from .project_detector import get_project_detector
 # Load .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class KiCadPCBConverter:
     def __init__(self):
@@ -28,6 +31,13 @@ class KiCadPCBConverter:
         Return:
             dict: Base64 encoded data and metadata of the converted image
         """
+        return base64.b64encode(self.pcb_to_jpg_bytes(boardname, layers, cleanup)).decode('utf-8')
+
+    def pcb_to_jpg_bytes(self, boardname, layers=None, cleanup=True):
+        """Convert PCB to JPG via SVG
+        Return:
+            bytes: Raw JPEG data of the converted image
+        """
         # Default layer settings (front and back)
         if layers is None:
             layers = ["F.Cu", "B.Cu", "F.SilkS", "B.SilkS", "F.Mask", "B.Mask"]
@@ -35,13 +45,10 @@ class KiCadPCBConverter:
             pcb_path = self.get_pcb_path_by_name(boardname)
         except Exception as e:
             raise RuntimeError(f"Error occurred while finding board file, please write correct path in .env: {e}")
-        # Create temporary files
+        # Create temporary file
         with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as svg_temp:
             svg_path = svg_temp.name
         
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as jpg_temp:
-            jpg_path = jpg_temp.name
-        
         # Create screenshots directory if it doesn't exist
         screenshots_dir = Path(__file__).parent.parent.parent / "screenshots"
         screenshots_dir.mkdir(exist_ok=True)
@@ -63,53 +70,44 @@ class KiCadPCBConverter:
                 pcb_path
             ]
             
-            print(f"Executing command: {' '.join(cmd)}")  # For debugging
+            logger.debug("Executing command: %s", ' '.join(cmd))
             
             # Generate SVG with KiCad CLI
             result = subprocess.run(cmd, check=True, capture_output=True, text=True)
             
-            # Convert SVG to JPG
+            # Convert SVG to JPG, encoding in memory instead of through a temporary file
             png_data = cairosvg.svg2png(url=svg_path)
             image = Image.open(io.BytesIO(png_data))
             rgb_image = image.convert('RGB')
             
-            # Save temporary file
-            rgb_image.save(jpg_path, 'JPEG')
+            jpg_buffer = io.BytesIO()
+            rgb_image.save(jpg_buffer, 'JPEG')
+            jpg_data = jpg_buffer.getvalue()
             
             # Also save permanent screenshot
-            rgb_image.save(permanent_jpg_path, 'JPEG')
-            print(f"Screenshot saved to: {permanent_jpg_path}")
-            
-            with open(jpg_path, 'rb') as f:
-                jpg_data = f.read()
+            permanent_jpg_path.write_bytes(jpg_data)
+            logger.info("Screenshot saved to: %s", permanent_jpg_path)
             
-            # Encode to Base64
-            base64_data = base64.b64encode(jpg_data).decode('utf-8')
             if cleanup:
-                # Delete temporary files
+                # Delete temporary file
                 os.unlink(svg_path)
-                os.unlink(jpg_path)
                 
-            return base64_data
+            return jpg_data
 
             
         except subprocess.CalledProcessError as e:
-            # Clean up temporary files on failure
+            # Clean up temporary file on failure
             if os.path.exists(svg_path):
                 os.unlink(svg_path)
-            if os.path.exists(jpg_path):
-                os.unlink(jpg_path)
             
             # Print detailed error information
-            print(f"Standard output: {e.stdout}")
-            print(f"Standard error: {e.stderr}")
+            logger.error("Standard output: %s", e.stdout)
+            logger.error("Standard error: %s", e.stderr)
             raise RuntimeError(f"KiCad CLI execution error: {e}")
         except Exception as e:
-            # Clean up temporary files on failure
+            # Clean up temporary file on failure
             if os.path.exists(svg_path):
                 os.unlink(svg_path)
-            if os.path.exists(jpg_path):
-                os.unlink(jpg_path)
             raise RuntimeError(f"Conversion error: {e}")
     
 
@@ -131,13 +129,13 @@ class KiCadPCBConverter:
             if pcb_path:
                 return str(pcb_path)
         except Exception as e:
-            print(f"Project detection failed, falling back to PCB_PATHS: {e}")
+            logger.warning("Project detection failed, falling back to PCB_PATHS: %s", e)
         
         # Fallback to old PCB_PATHS method
         pcb_paths = os.getenv('PCB_PATHS')
         
         if not pcb_paths:
-            print("Neither PROJECT_PATHS nor PCB_PATHS environment variable is set.")
+            logger.warning("Neither PROJECT_PATHS nor PCB_PATHS environment variable is set.")
             return None
         
         # Convert comma-separated paths to list and remove whitespace
@@ -155,5 +153,5 @@ class KiCadPCBConverter:
             if filename == boardname:
                 return path
         
-        print(f"File '{boardname}' not found in any configured paths.")
+        logger.warning("File '%s' not found in any configured paths.", boardname)
         return None
\ No newline at end of file